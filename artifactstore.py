@@ -0,0 +1,258 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+ARTIFACT_DIR = "artifacts"
+
+# Size the store is trimmed to by gc() when no other bound is given
+MAX_BYTES = 512 * 1024 * 1024
+
+# How long a writer waits for the manifest lock, and after how long a temporary
+# file left behind by a crashed writer is cleared by gc()
+LOCK_TIMEOUT = 30
+STALE_AFTER = 120
+
+class ArtifactStore:
+    """Files named by the sha256 of their content, under <root>/objects/<2 hex>/<62 hex><ext>.
+
+    A file is written to a temporary name in its shard and renamed into
+    place, so readers never see half-written files and workers storing the
+    same content at once end up with the same single file. manifest.jsonl
+    records each stored file once per label and render key (digest,
+    extension, size, label, render key, time) and lets a later run find
+    what an earlier one rendered. Appending to it and gc() take an OS lock
+    on manifest.lock, so gc() never deletes a file whose entry is being
+    appended.
+    """
+
+    def __init__(self, root=ARTIFACT_DIR):
+        self.root = root
+        self.objects = os.path.join(root, 'objects')
+        self.manifest_path = os.path.join(root, 'manifest.jsonl')
+        self.lock_path = os.path.join(root, 'manifest.lock')
+        self.index_lock = threading.Lock()
+        self._reset_index()
+        os.makedirs(self.objects, exist_ok=True)
+
+    def path(self, digest, ext=''):
+        return os.path.join(self.objects, digest[:2], digest[2:] + ext)
+
+    @contextmanager
+    def _lock(self):
+        # An OS lock on a lock file that is never deleted: it is released when
+        # its holder exits or crashes, so there is no stale lock to clear
+        with open(self.lock_path, 'a+b') as lock_file:
+            fd = lock_file.fileno()
+            deadline = time.monotonic() + LOCK_TIMEOUT
+            while True:
+                try:
+                    if fcntl:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    else:
+                        lock_file.seek(0)
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Could not lock {self.lock_path}")
+                    time.sleep(0.01)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def _write_object(self, path, data):
+        shard = os.path.dirname(path)
+        os.makedirs(shard, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=shard, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put(self, data, ext='', label=None, key=None):
+        """Store data (text or bytes) once and return the path of its file."""
+        text = isinstance(data, str)
+        if text:
+            data = data.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest, ext)
+        try:
+            os.utime(path)  # Already stored: only mark it as recently used for gc()
+        except FileNotFoundError:
+            self._write_object(path, data)
+        record = (digest, ext, label, key)
+        with self._lock():
+            # gc() may have deleted the file since; it cannot while the lock is held
+            if not os.path.exists(path):
+                self._write_object(path, data)
+            with self.index_lock:
+                self._read_manifest()
+                latest = self.keys.get(key)
+                if key is None:
+                    recorded = record in self.recorded
+                else:
+                    recorded = latest is not None and (latest['digest'], latest['ext'], latest['label']) == record[:3]
+            if not recorded:
+                entry = {'digest': digest, 'ext': ext, 'size': len(data), 'label': label, 'key': key,
+                         'text': text, 'time': time.time()}
+                with open(self.manifest_path, 'a', encoding='utf-8') as manifest:
+                    manifest.write(json.dumps(entry) + '\n')
+                with self.index_lock:
+                    self.recorded.add(record)
+                    if key is not None:
+                        self.keys[key] = entry
+        return path
+
+    def entries(self):
+        """Every complete manifest entry, oldest first."""
+        entries = []
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as manifest:
+                for line in manifest:
+                    if line.endswith('\n'):
+                        entry = json.loads(line)
+                        if 'generation' not in entry:
+                            entries.append(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _reset_index(self, generation=None):
+        # keys maps a render key to its latest entry and recorded holds the
+        # (digest, ext, label, key) of every entry, so put() does not repeat them
+        self.keys, self.recorded = {}, set()
+        self.manifest_offset, self.manifest_generation = 0, generation
+
+    def _read_manifest(self):
+        # Picks up entries other workers appended since the last read; a line still
+        # being written is left for the next read, and a rewritten manifest is reread
+        try:
+            with open(self.manifest_path, 'rb') as manifest:
+                # gc() replaces the manifest with one whose first line names a new
+                # generation; inode numbers cannot tell them apart as they are reused
+                first = manifest.readline()
+                generation = json.loads(first).get('generation') if first.endswith(b'\n') else None
+                if generation != self.manifest_generation:
+                    self._reset_index(generation)
+                manifest.seek(self.manifest_offset)
+                for line in manifest:
+                    if not line.endswith(b'\n'):
+                        break
+                    self.manifest_offset += len(line)
+                    entry = json.loads(line)
+                    if 'generation' in entry:
+                        continue
+                    self.recorded.add((entry['digest'], entry['ext'], entry['label'], entry['key']))
+                    if entry.get('key') is not None:
+                        self.keys[entry['key']] = entry
+        except FileNotFoundError:
+            self._reset_index()
+
+    def find(self, key):
+        """Manifest entry of the artifact stored for a render key, by this or an earlier run, or None."""
+        with self.index_lock:
+            entry = self.keys.get(key)
+            if entry is None:
+                self._read_manifest()
+                entry = self.keys.get(key)
+        if entry is None:
+            return None
+        try:
+            os.utime(self.path(entry['digest'], entry['ext']))
+        except FileNotFoundError:
+            # Removed by gc() since the manifest was read; a later put() records it again
+            with self.index_lock:
+                self.keys.pop(key, None)
+                self.recorded.discard((entry['digest'], entry['ext'], entry['label'], key))
+            return None
+        return entry
+
+    def load(self, key):
+        """Data stored for a render key (text if it was stored as text), or None."""
+        entry = self.find(key)
+        if entry is None:
+            return None
+        try:
+            with open(self.path(entry['digest'], entry['ext']), 'rb') as artifact:
+                data = artifact.read()
+        except FileNotFoundError:
+            return None
+        return data.decode('utf-8') if entry.get('text') else data
+
+    def usage(self):
+        """Total size of the stored files in bytes."""
+        return sum(size for _, size, _ in self._files())
+
+    def _files(self):
+        files = []
+        for shard in os.scandir(self.objects):
+            if shard.is_dir():
+                for item in os.scandir(shard.path):
+                    stat = item.stat()
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+        return files
+
+    def gc(self, max_bytes=MAX_BYTES):
+        """Delete the least recently used files until the store holds at most max_bytes; returns the bytes freed.
+
+        Temporary files left by crashed writers are removed too, and the
+        manifest is rewritten, through a rename, without entries for
+        deleted files or repeated entries.
+        """
+        freed = 0
+        with self._lock():
+            now = time.time()
+            files = []
+            for mtime, size, path in self._files():
+                if os.path.basename(path).startswith('.tmp-'):
+                    if now - mtime > STALE_AFTER:
+                        os.remove(path)
+                else:
+                    files.append((mtime, size, path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+                freed += size
+
+            latest = {}
+            for entry in self.entries():
+                if os.path.exists(self.path(entry['digest'], entry['ext'])):
+                    latest[(entry['digest'], entry['ext'], entry['label'], entry['key'])] = entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.tmp-manifest-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as manifest:
+                manifest.write(json.dumps({'generation': uuid.uuid4().hex}) + '\n')
+                for entry in sorted(latest.values(), key=lambda entry: entry['time']):
+                    manifest.write(json.dumps(entry) + '\n')
+            os.replace(tmp_path, self.manifest_path)
+            with self.index_lock:
+                self._reset_index()
+        return freed
+
+@lru_cache(maxsize=None)
+def open_store(root=ARTIFACT_DIR):
+    """The store kept under a directory, shared by everything in this process that writes there."""
+    return ArtifactStore(root)
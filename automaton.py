@@ -0,0 +1,186 @@
+from array import array
+from functools import lru_cache
+
+class Detector:
+    """Shared views of a detector stored as flat transition and output arrays.
+
+    Subclasses fill in alphabet, symbol_index, num_states, state_names,
+    transitions (indexed by state * len(alphabet) + symbol index),
+    mealy_outputs (same indexing) and moore_outputs (one per state).
+    """
+
+    def next_state(self, state, symbol):
+        return self.transitions[state * len(self.alphabet) + self.symbol_index[symbol]]
+
+    def mealy_transitions(self):
+        """Transitions as {state: {symbol: (next_state, output)}} with string names, as the Mealy generators use."""
+        k = len(self.alphabet)
+        return {self.state_names[state]: {symbol: (self.state_names[self.transitions[state * k + i]],
+                                                   str(self.mealy_outputs[state * k + i]))
+                                          for i, symbol in enumerate(self.alphabet)}
+                for state in range(self.num_states)}
+
+    def moore_transitions(self):
+        """Transitions {state: {symbol: next_state}} and outputs {state: output}, as the Moore generators use."""
+        k = len(self.alphabet)
+        transitions = {self.state_names[state]: {symbol: self.state_names[self.transitions[state * k + i]]
+                                                 for i, symbol in enumerate(self.alphabet)}
+                       for state in range(self.num_states)}
+        outputs = {name: str(output) for name, output in zip(self.state_names, self.moore_outputs)}
+        return transitions, outputs
+
+class SequenceDetector(Detector):
+    """Sequence-detector automaton built from the KMP failure function.
+
+    State i means the last i symbols read are the first i symbols of the
+    sequence; state n (the final state) means the whole sequence was just
+    seen. Transitions are held in one flat integer array indexed by
+    state * len(alphabet) + symbol index, so building is linear in
+    len(sequence) * len(alphabet).
+
+    In overlapping mode the final state falls back along the failure
+    function, so the tail of one match can start the next. In
+    non-overlapping mode it behaves like the start state.
+
+    The same states serve both output models: a Mealy transition outputs 1
+    when it enters the final state, and in the Moore model the final state
+    outputs 1. A precomputed transitions array (as stored by catalogue.py)
+    skips the construction.
+    """
+
+    def __init__(self, sequence, overlapping=True, alphabet='01', transitions=None):
+        self.sequence = sequence
+        self.patterns = (sequence,)
+        self.output_codes = (1,)
+        self.overlapping = overlapping
+        self.alphabet = alphabet
+        self.symbol_index = {symbol: i for i, symbol in enumerate(alphabet)}
+        self.num_states = len(sequence) + 1
+        self.state_names = [f'S{i}' for i in range(self.num_states)]
+
+        n = len(sequence)
+        self.transitions = array('i', transitions) if transitions is not None else self._build(overlapping)
+        self.mealy_outputs = array('B', (next_state == n for next_state in self.transitions))
+        self.moore_outputs = array('B', (state == n for state in range(self.num_states)))
+
+    def _build(self, overlapping):
+        n = len(self.sequence)
+        k = len(self.alphabet)
+        codes = [self.symbol_index[symbol] for symbol in self.sequence]
+        transitions = array('i', [0]) * (self.num_states * k)
+        transitions[codes[0]] = 1
+        failure = 0  # failure state of the state being filled in
+        for state in range(1, self.num_states):
+            if state == n and not overlapping:
+                failure = 0
+            row, fallback_row = state * k, failure * k
+            transitions[row:row + k] = transitions[fallback_row:fallback_row + k]
+            if state < n:
+                transitions[row + codes[state]] = state + 1
+                failure = transitions[fallback_row + codes[state]]
+        return transitions
+
+@lru_cache(maxsize=1024)
+def build_detector(sequence, overlapping=True, alphabet='01'):
+    """Build (or reuse) the detector for a sequence; detectors are never mutated."""
+    return SequenceDetector(sequence, overlapping, alphabet)
+
+class MultiPatternDetector(Detector):
+    """Detector for a set of patterns built with Aho-Corasick goto/fail links.
+
+    States are the nodes of the trie of all patterns, numbered breadth
+    first, so S0 is the start state and each state stands for the longest
+    suffix of the input that is a prefix of some pattern. A state's row is
+    copied from its failure state's row and then overridden by its trie
+    children, which makes building linear in the total pattern length
+    times len(alphabet).
+
+    Pattern j has output code output_codes[j] (j + 1 by default). A state
+    outputs the code of the longest pattern ending there, 0 if none, and a
+    Mealy transition outputs the code of the state it enters. In
+    non-overlapping mode every state that outputs a code behaves like the
+    start state, and states that can no longer be reached are dropped.
+    """
+
+    def __init__(self, patterns, overlapping=True, alphabet='01', output_codes=None):
+        self.patterns = tuple(patterns)
+        self.output_codes = tuple(output_codes) if output_codes is not None else tuple(range(1, len(self.patterns) + 1))
+        if not self.patterns or '' in self.patterns:
+            raise ValueError("At least one pattern is needed and patterns must not be empty")
+        if len(self.output_codes) != len(self.patterns) or min(self.output_codes) <= 0:
+            raise ValueError("Every pattern needs a positive output code")
+        self.overlapping = overlapping
+        self.alphabet = alphabet
+        self.symbol_index = {symbol: i for i, symbol in enumerate(alphabet)}
+        k = len(alphabet)
+
+        # Trie: children[node] maps a symbol index to the child node
+        children = [{}]
+        codes = [0]
+        for pattern, code in zip(self.patterns, self.output_codes):
+            node = 0
+            for symbol in pattern:
+                if symbol not in self.symbol_index:
+                    raise ValueError(f"Pattern '{pattern}' contains symbols outside the alphabet '{alphabet}'")
+                child = children[node].get(self.symbol_index[symbol])
+                if child is None:
+                    child = len(children)
+                    children[node][self.symbol_index[symbol]] = child
+                    children.append({})
+                    codes.append(0)
+                node = child
+            # A repeated pattern keeps the code it was first given
+            codes[node] = codes[node] or code
+
+        # Breadth-first order, so a node's failure state is complete before the node
+        order = [0]
+        for node in order:
+            order.extend(children[node].values())
+        renumber = array('i', [0]) * len(order)
+        for state, node in enumerate(order):
+            renumber[node] = state
+
+        transitions = array('i', [0]) * (len(order) * k)
+        failure = array('i', [0]) * len(order)
+        outputs = array('i', [0]) * len(order)
+        for state, node in enumerate(order):
+            row, fallback_row = state * k, failure[state] * k
+            if state:
+                transitions[row:row + k] = transitions[fallback_row:fallback_row + k]
+                outputs[state] = codes[node] or outputs[failure[state]]
+            for symbol, child in children[node].items():
+                if state:
+                    failure[renumber[child]] = transitions[fallback_row + symbol]
+                transitions[row + symbol] = renumber[child]
+
+        if not overlapping:
+            for state in range(1, len(order)):
+                if outputs[state]:
+                    transitions[state * k:(state + 1) * k] = transitions[0:k]
+            transitions, outputs = self._reachable(transitions, outputs, k)
+
+        self.transitions = transitions
+        self.num_states = len(outputs)
+        self.state_names = [f'S{i}' for i in range(self.num_states)]
+        self.moore_outputs = outputs
+        self.mealy_outputs = array('i', (outputs[next_state] for next_state in transitions))
+
+    @staticmethod
+    def _reachable(transitions, outputs, k):
+        """Keep only the states reachable from S0, renumbered in breadth-first order."""
+        renumber = {0: 0}
+        order = [0]
+        for state in order:
+            for next_state in transitions[state * k:(state + 1) * k]:
+                if next_state not in renumber:
+                    renumber[next_state] = len(order)
+                    order.append(next_state)
+        if len(order) == len(outputs):
+            return transitions, outputs
+        kept = array('i', (renumber[transitions[state * k + i]] for state in order for i in range(k)))
+        return kept, array('i', (outputs[state] for state in order))
+
+@lru_cache(maxsize=1024)
+def build_multi_detector(patterns, overlapping=True, alphabet='01', output_codes=None):
+    """Build (or reuse) the detector for a tuple of patterns; detectors are never mutated."""
+    return MultiPatternDetector(patterns, overlapping, alphabet, output_codes)
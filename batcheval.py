@@ -0,0 +1,47 @@
+import numpy as np
+
+from evaluator import VARIABLES
+from bitparallel import truth_table_signature
+
+# Number of set bits in every possible byte, used to popcount packed tables
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def num_words(num_vars):
+    """Number of uint64 words needed to hold one packed truth table."""
+    return max(1, (1 << num_vars) // 64)
+
+def packed_truth_tables(exprs, num_vars, variables=VARIABLES):
+    """Evaluate K expressions and return their truth tables as a K x words uint64 matrix.
+
+    Bit i of the packed row (little-endian across words) is the output for
+    row i of the truth table, matching bitparallel.truth_table_signature.
+    """
+    width = num_words(num_vars) * 8
+    data = b''.join(truth_table_signature(expr, num_vars, variables).to_bytes(width, 'little')
+                    for expr in exprs)
+    return np.frombuffer(data, dtype='<u8').reshape(len(exprs), width // 8)
+
+def unpack_truth_tables(packed, num_vars):
+    """Expand a packed matrix into a K x 2^n boolean matrix."""
+    bits = np.unpackbits(packed.view(np.uint8), axis=1, bitorder='little')
+    return bits[:, :1 << num_vars].astype(bool)
+
+def truth_table_matrix(exprs, num_vars, variables=VARIABLES):
+    """Evaluate K expressions and return a K x 2^n boolean matrix, one row per expression."""
+    return unpack_truth_tables(packed_truth_tables(exprs, num_vars, variables), num_vars)
+
+def popcount(packed):
+    """Count set bits along the last axis of a uint64 array."""
+    return POPCOUNT_TABLE[packed.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+def pairwise_equal(packed):
+    """K x K matrix telling which expressions have identical truth tables."""
+    return np.all(packed[:, None, :] == packed[None, :, :], axis=-1)
+
+def pairwise_hamming(packed):
+    """K x K matrix of the number of rows on which two truth tables differ."""
+    return popcount(packed[:, None, :] ^ packed[None, :, :])
+
+def hamming_to(packed, reference):
+    """Number of rows on which each packed truth table differs from one reference row."""
+    return popcount(packed ^ reference[None, :])
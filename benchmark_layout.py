@@ -0,0 +1,41 @@
+import time
+
+from graphviz import ExecutableNotFound
+
+from catalogue import load_catalogue
+from chainlayout import chain_svg
+from fsmsvg import machine_graph
+from gvrender import render_svgs
+
+# Function to time both diagram backends on every machine in the catalogue
+def benchmark(detectors, model='mealy'):
+    """Seconds taken by each backend to lay out every detector; Graphviz is skipped if dot is missing."""
+    timings = {}
+    start = time.perf_counter()
+    for detector in detectors:
+        chain_svg(detector, model)
+    timings['python'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        render_svgs([machine_graph(detector, model).source for detector in detectors])
+        timings['graphviz'] = time.perf_counter() - start
+    except ExecutableNotFound:
+        timings['graphviz'] = None
+    return timings
+
+def main():
+    catalogue = load_catalogue()
+    detectors = [catalogue.detector(catalogue.pattern(i), overlapping) for i in range(len(catalogue))
+                 for overlapping in (True, False)]
+    for model in ('mealy', 'moore'):
+        timings = benchmark(detectors, model)
+        for backend, seconds in timings.items():
+            if seconds is None:
+                print(f"{model}: {backend} backend unavailable (dot not found)")
+            else:
+                print(f"{model}: {backend} backend laid out {len(detectors)} diagrams in {seconds:.3f} s "
+                      f"({1000 * seconds / len(detectors):.2f} ms each)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from functools import lru_cache
+import itertools
+
+from evaluator import CACHE_SIZE, VARIABLES
+from exprparser import as_node
+
+@lru_cache(maxsize=None)
+def variable_masks(num_vars):
+    """Return one 2^n-bit mask per variable; bit i of a mask is that variable's value in row i.
+
+    Rows follow itertools.product([0, 1], repeat=num_vars), so the first
+    variable is the most significant bit of the row index
+    (for 3 variables A = 0b11110000, B = 0b11001100, C = 0b10101010).
+    """
+    num_rows = 1 << num_vars
+    masks = []
+    for k in range(num_vars):
+        half = 1 << (num_vars - 1 - k)
+        period = half * 2
+        block = ((1 << half) - 1) << half
+        masks.append(block * (((1 << num_rows) - 1) // ((1 << period) - 1)))
+    return tuple(masks)
+
+def apply_gate(op, operands, full):
+    """Combine already evaluated operand columns with one gate."""
+    if op == 'not':
+        return full ^ operands[0]
+    left, right = operands
+    if op == 'and':
+        return left & right
+    if op == 'or':
+        return left | right
+    if op == 'xor':
+        return left ^ right
+    if op == 'nand':
+        return full ^ (left & right)
+    if op == 'nor':
+        return full ^ (left | right)
+    return full ^ (left ^ right)  # xnor
+
+def circuit_signature(root, variables):
+    """Truth-table signature of an expression DAG, evaluating every shared node once."""
+    num_vars = len(variables)
+    masks = dict(zip(variables, variable_masks(num_vars)))
+    full = (1 << (1 << num_vars)) - 1
+    values = {}
+    for node in root.postorder():
+        if node.op == 'var':
+            if node.args[0] not in masks:
+                raise ValueError(f"Variable '{node.args[0]}' in expression '{root}' is not one of {list(variables)}")
+            values[node] = masks[node.args[0]]
+        elif node.op == 'const':
+            values[node] = full if node.args[0] else 0
+        else:
+            values[node] = apply_gate(node.op, [values[child] for child in node.args], full)
+    return values[root]
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _signature(root, variables):
+    return circuit_signature(root, variables)
+
+def truth_table_signature(expr, num_vars, variables=VARIABLES):
+    """Evaluate an expression (text or Node) over every row in one pass.
+
+    Returns an integer whose bit i is the output Q for row i of the truth
+    table over the first num_vars names in variables.
+    """
+    return _signature(as_node(expr), tuple(variables[:num_vars]))
+
+def signature_rows(signature, num_vars):
+    """Expand a signature into (values, Q) rows in itertools.product order."""
+    return [(values, bool(signature >> i & 1))
+            for i, values in enumerate(itertools.product([0, 1], repeat=num_vars))]
+
+def table_signature(truth_table):
+    """Pack (values, Q) rows back into a signature."""
+    signature = 0
+    for values, Q in truth_table:
+        if Q:
+            signature |= 1 << int(''.join(map(str, values)), 2)
+    return signature
@@ -0,0 +1,151 @@
+import os
+import random
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+
+from automaton import SequenceDetector, build_detector
+from fsmmin import minimize
+
+MIN_LENGTH = 3
+DEFAULT_MAX_LENGTH = 8
+CATALOGUE_DIR = "FSM_catalogue"
+
+# Pattern lengths of each level; 'easy' covers the 3-4 bit patterns the FSM
+# generators used to hard-code. The difficulty score (length plus fallback edges)
+# cannot be banded instead: a 5 bit pattern can score lower than a 4 bit one
+LEVELS = {'easy': (3, 4), 'medium': (5, 6), 'hard': (7, 255)}
+
+def entry_dtype(max_length):
+    """One fixed-size record per pattern, so the file can be memory-mapped and indexed directly."""
+    return np.dtype([
+        ('length', 'u1'),
+        ('value', '<u4'),                  # the pattern's bits, first symbol most significant
+        ('border', 'u1'),                  # longest proper prefix that is also a suffix
+        ('fallback_edges', 'u1', (2,)),    # overlapping, non-overlapping
+        ('mealy_min_states', 'u1', (2,)),
+        ('moore_min_states', 'u1', (2,)),
+        ('difficulty', 'u1'),
+        ('transitions', 'u1', (2, max_length + 1, 2)),
+    ])
+
+def pattern_index(sequence, min_length=MIN_LENGTH):
+    """Position of a binary pattern in a catalogue: ordered by length, then by value."""
+    return (1 << len(sequence)) - (1 << min_length) + int(sequence, 2)
+
+def fallback_edges(detector):
+    """Transitions that go neither forward nor back to S0, the ones students usually get wrong."""
+    return sum(1 for state in range(detector.num_states) for next_state in detector.transitions[2 * state:2 * state + 2]
+               if next_state not in (0, state + 1))
+
+class SequenceCatalogue:
+    """Every binary pattern from min_length to max_length with its precomputed detectors.
+
+    Each record holds the overlapping and non-overlapping transition
+    tables (shared by the Mealy and Moore models, whose outputs follow from
+    the pattern length), minimal state counts and difficulty features. The
+    records live in a single .npy file that load() memory-maps, so opening
+    the catalogue reads nothing until an entry is used.
+    """
+
+    def __init__(self, entries, min_length=MIN_LENGTH):
+        self.entries = entries
+        self.min_length = min_length
+        self.max_length = entries.dtype['transitions'].shape[1] - 1
+
+    @classmethod
+    def build(cls, max_length=DEFAULT_MAX_LENGTH, min_length=MIN_LENGTH):
+        entries = np.zeros((1 << (max_length + 1)) - (1 << min_length), dtype=entry_dtype(max_length))
+        for length in range(min_length, max_length + 1):
+            for value in range(1 << length):
+                sequence = format(value, f'0{length}b')
+                entry = entries[pattern_index(sequence, min_length)]
+                entry['length'] = length
+                entry['value'] = value
+                for mode, overlapping in enumerate((True, False)):
+                    detector = SequenceDetector(sequence, overlapping)
+                    entry['transitions'][mode, :length + 1] = np.reshape(detector.transitions, (length + 1, 2))
+                    entry['fallback_edges'][mode] = fallback_edges(detector)
+                    entry['mealy_min_states'][mode] = minimize(detector, 'mealy').num_states
+                    entry['moore_min_states'][mode] = minimize(detector, 'moore').num_states
+                    if overlapping:
+                        # The final state's overlapping transitions leave from the border
+                        entry['border'] = max(detector.transitions[2 * length:2 * length + 2]) - 1
+                entry['difficulty'] = length + entry['fallback_edges'][0]
+        return cls(entries, min_length)
+
+    def save(self, path):
+        """Write the catalogue to a temporary file and rename it into place.
+
+        Another process can then only ever open a missing or a complete file,
+        never one that is still being written.
+        """
+        directory = os.path.dirname(path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.npy')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                np.save(tmp_file, self.entries)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path, min_length=MIN_LENGTH):
+        return cls(np.load(path, mmap_mode='r'), min_length)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, sequence):
+        return (self.min_length <= len(sequence) <= self.max_length) and set(sequence) <= {'0', '1'}
+
+    def pattern(self, index):
+        entry = self.entries[index]
+        return format(int(entry['value']), f"0{entry['length']}b")
+
+    def features(self, sequence):
+        entry = self.entries[pattern_index(sequence, self.min_length)]
+        return {name: entry[name].tolist() for name in self.entries.dtype.names if name != 'transitions'}
+
+    def detector(self, sequence, overlapping=True):
+        """The sequence's detector from the stored table; patterns outside the catalogue are built."""
+        if sequence not in self:
+            return build_detector(sequence, overlapping)
+        entry = self.entries[pattern_index(sequence, self.min_length)]
+        table = entry['transitions'][0 if overlapping else 1, :len(sequence) + 1]
+        return SequenceDetector(sequence, overlapping, transitions=table.ravel().tolist())
+
+    def _level_range(self, level):
+        # Entries are ordered by length, so each level is one contiguous slice
+        if level not in LEVELS:
+            raise ValueError(f"Unknown level '{level}', expected one of {list(LEVELS)}")
+        low, high = LEVELS[level]
+        low, high = max(low, self.min_length), min(high, self.max_length)
+        if low > high:
+            return 0, 0
+        return (1 << low) - (1 << self.min_length), (1 << (high + 1)) - (1 << self.min_length)
+
+    def sample(self, level='easy', count=None):
+        """One pattern of the given level in O(1), or count distinct ones."""
+        start, stop = self._level_range(level)
+        if start == stop:
+            raise ValueError(f"The catalogue has no '{level}' patterns up to length {self.max_length}")
+        if count is None:
+            return self.pattern(random.randrange(start, stop))
+        return [self.pattern(i) for i in random.sample(range(start, stop), count)]
+
+@lru_cache(maxsize=None)
+def load_catalogue(max_length=DEFAULT_MAX_LENGTH, directory=CATALOGUE_DIR):
+    """Open the catalogue for max_length, building and saving it the first time.
+
+    Workers starting together on a fresh checkout may each build it; every
+    one renames a complete file into place, so whichever wins is read.
+    """
+    path = os.path.join(directory, f"sequences_{MIN_LENGTH}_{max_length}.npy")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        SequenceCatalogue.build(max_length).save(path)
+    return SequenceCatalogue.load(path)
@@ -0,0 +1,138 @@
+import math
+from html import escape
+
+# Geometry of the layout, in SVG points
+NODE_RADIUS = 22
+NODE_SPACING = 110
+MARGIN = 40
+ARC_DEPTH = 34      # depth of an arc that jumps one state
+ARC_STEP = 22       # extra depth for every further state spanned
+ARC_SPREAD = 20     # degrees off the vertical at which a one-state arc meets its nodes
+ARC_SPREAD_STEP = 8
+ARC_SPREAD_MAX = 45
+LOOP_CLEARANCE = 40 # extra height of arcs above the chain, where the self-loops are
+ARROW_LENGTH = 10
+ARROW_WIDTH = 4
+FONT = 'font-family="Times,serif" font-size="14.00"'
+
+def _point_on_circle(cx, cy, towards_x, towards_y):
+    dx, dy = towards_x - cx, towards_y - cy
+    length = math.hypot(dx, dy) or 1.0
+    return cx + NODE_RADIUS * dx / length, cy + NODE_RADIUS * dy / length
+
+def _arrowhead(tip_x, tip_y, from_x, from_y):
+    """Points of a filled arrowhead ending at the tip, pointing away from (from_x, from_y)."""
+    dx, dy = tip_x - from_x, tip_y - from_y
+    length = math.hypot(dx, dy) or 1.0
+    ux, uy = dx / length, dy / length
+    base_x, base_y = tip_x - ARROW_LENGTH * ux, tip_y - ARROW_LENGTH * uy
+    points = [(tip_x, tip_y), (base_x - ARROW_WIDTH * uy, base_y + ARROW_WIDTH * ux),
+              (base_x + ARROW_WIDTH * uy, base_y - ARROW_WIDTH * ux)]
+    return ' '.join(f"{x:.2f},{y:.2f}" for x, y in points)
+
+def _edge_group(edge_id, source, target, path, arrow, label, label_x, label_y):
+    # Same structure as dot's output, so fsmsvg.hole_variant can find and edit the edge
+    return (f'<!-- {escape(source)}&#45;&gt;{escape(target)} -->\n'
+            f'<g id="{edge_id}" class="edge">\n'
+            f'<title>{escape(source)}&#45;&gt;{escape(target)}</title>\n'
+            f'<path fill="none" stroke="black" d="{path}"/>\n'
+            f'<polygon fill="black" stroke="black" points="{arrow}"/>\n'
+            f'<text text-anchor="middle" x="{label_x:.2f}" y="{label_y:.2f}" {FONT}>{escape(label)}</text>\n'
+            f'</g>\n')
+
+def _self_loop(x, y, index):
+    # Loops alternate above and below the node when a state has several
+    side = -1 if index % 2 == 0 else 1
+    reach = NODE_RADIUS * (2.6 + 0.8 * (index // 2))
+    start = (x - NODE_RADIUS * 0.5, y + side * NODE_RADIUS * 0.87)
+    end = (x + NODE_RADIUS * 0.5, y + side * NODE_RADIUS * 0.87)
+    control1 = (x - NODE_RADIUS * 1.2, y + side * reach)
+    control2 = (x + NODE_RADIUS * 1.2, y + side * reach)
+    path = (f"M{start[0]:.2f},{start[1]:.2f} C{control1[0]:.2f},{control1[1]:.2f} "
+            f"{control2[0]:.2f},{control2[1]:.2f} {end[0]:.2f},{end[1]:.2f}")
+    label_y = y + side * (reach * 0.75 + 8) + (5 if side > 0 else 0)
+    return path, _arrowhead(*end, *control2), x, label_y, y + side * reach
+
+def _arc(x1, x2, y, depth, spread):
+    """Cubic curve between two nodes; negative depth bends above the chain, positive below.
+
+    The curve leaves and enters the nodes spread degrees off the vertical,
+    so arcs of different spans that share a node do not overlap.
+    """
+    side = 1 if depth > 0 else -1
+    towards = 1 if x2 > x1 else -1
+    sin_a, cos_a = math.sin(math.radians(spread)), math.cos(math.radians(spread))
+    start = (x1 + towards * NODE_RADIUS * sin_a, y + side * NODE_RADIUS * cos_a)
+    end = (x2 - towards * NODE_RADIUS * sin_a, y + side * NODE_RADIUS * cos_a)
+    # Control arm length that puts the curve's apex exactly depth away from the chain
+    reach = (abs(depth) - NODE_RADIUS * cos_a) * 4 / (3 * cos_a)
+    control1 = (start[0] + towards * reach * sin_a, start[1] + side * reach * cos_a)
+    control2 = (end[0] - towards * reach * sin_a, end[1] + side * reach * cos_a)
+    path = (f"M{start[0]:.2f},{start[1]:.2f} C{control1[0]:.2f},{control1[1]:.2f} "
+            f"{control2[0]:.2f},{control2[1]:.2f} {end[0]:.2f},{end[1]:.2f}")
+    apex_x = (start[0] + 3 * control1[0] + 3 * control2[0] + end[0]) / 8
+    apex_y = (start[1] + 3 * control1[1] + 3 * control2[1] + end[1]) / 8
+    label_y = apex_y - 5 if side < 0 else apex_y + 15
+    return path, _arrowhead(*end, *control2), apex_x, label_y, apex_y
+
+def chain_svg(detector, model='mealy'):
+    """Lay out a detector as a left-to-right chain and return the SVG text.
+
+    States sit on one row in order. An edge to the next state is a straight
+    arrow, other forward jumps arc above the row and fallback edges arc
+    below it, deeper the more states they span. Labels use the same
+    'symbol/output' (Mealy) and 'state/output' (Moore) forms as the
+    Graphviz diagrams, and every edge group has the id edge_<state>_<symbol>.
+    """
+    k = len(detector.alphabet)
+    names = detector.state_names
+    y = 0.0
+    positions = [MARGIN + NODE_RADIUS + i * NODE_SPACING for i in range(detector.num_states)]
+
+    edges = []
+    top, bottom = -NODE_RADIUS, NODE_RADIUS
+    parallel = {}
+    for state in range(detector.num_states):
+        for i, symbol in enumerate(detector.alphabet):
+            target = detector.transitions[state * k + i]
+            index = parallel.get((state, target), 0)
+            parallel[(state, target)] = index + 1
+            label = f"{symbol}/{detector.mealy_outputs[state * k + i]}" if model == 'mealy' else symbol
+            x1, x2 = positions[state], positions[target]
+            if target == state:
+                path, arrow, label_x, label_y, extent = _self_loop(x1, y, index)
+            elif target == state + 1 and index == 0:
+                start, end = (x1 + NODE_RADIUS, y), (x2 - NODE_RADIUS, y)
+                path = f"M{start[0]:.2f},{start[1]:.2f} L{end[0]:.2f},{end[1]:.2f}"
+                arrow, label_x, label_y, extent = _arrowhead(*end, *start), (x1 + x2) / 2, y - 6, y
+            else:
+                # Forward jumps go above the chain, clear of the self-loops there
+                span = abs(target - state)
+                depth = ARC_DEPTH + ARC_STEP * (span - 1 + index)
+                spread = min(ARC_SPREAD + ARC_SPREAD_STEP * (span - 1 + index), ARC_SPREAD_MAX)
+                if target > state:
+                    depth = -(depth + LOOP_CLEARANCE)
+                path, arrow, label_x, label_y, extent = _arc(x1, x2, y, depth, spread)
+            top, bottom = min(top, extent, label_y - 14), max(bottom, extent, label_y + 4)
+            edges.append(_edge_group(f"edge_{names[state]}_{symbol}", names[state], names[target],
+                                     path, arrow, label, label_x, label_y))
+
+    width = 2 * (MARGIN + NODE_RADIUS) + (detector.num_states - 1) * NODE_SPACING
+    height = bottom - top + 2 * MARGIN
+    offset = MARGIN - top
+
+    nodes = []
+    for state, (name, x) in enumerate(zip(names, positions)):
+        label = f"{name}/{detector.moore_outputs[state]}" if model == 'moore' else name
+        nodes.append(f'<g id="node_{name}" class="node">\n<title>{escape(name)}</title>\n'
+                     f'<ellipse fill="white" stroke="black" cx="{x:.2f}" cy="{y:.2f}" '
+                     f'rx="{NODE_RADIUS}" ry="{NODE_RADIUS}"/>\n'
+                     f'<text text-anchor="middle" x="{x:.2f}" y="{y + 5:.2f}" {FONT}>{escape(label)}</text>\n</g>\n')
+
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n'
+            f'<svg width="{width:.0f}pt" height="{height:.0f}pt" viewBox="0.00 0.00 {width:.2f} {height:.2f}" '
+            f'xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">\n'
+            f'<g id="graph0" class="graph" transform="translate(0 {offset:.2f})">\n'
+            f'<rect fill="white" stroke="none" x="0" y="{-offset:.2f}" width="{width:.2f}" height="{height:.2f}"/>\n'
+            + ''.join(edges) + ''.join(nodes) +
+            '</g>\n</svg>\n')
@@ -2,48 +2,82 @@ import random
 import os
 from fpdf import FPDF
 from PIL import Image
-import cairosvg
 import schemdraw
 import schemdraw.logic as logic
 from schemdraw.parsing import logicparse
 from datetime import datetime
+from equivalence import check_equivalence, format_input
+from exprdag import var, gate as make_gate
+from imagepipe import drawing_svg, add_svg, keep_image
+from rendercache import cached_render
 
 # Define possible gates
 gates = ['and', 'or', 'nand', 'nor', 'xor', 'xnor', 'not']
 
-def random_expression(variables, num_gates):
-    """Generate a random logic expression with a given number of gates and variables."""
+# Largest number of gates in a generated circuit
+MAX_GATES = 7
+
+def random_circuit(variables, num_gates):
+    """Generate a random logic circuit with exactly num_gates gates as an interned expression DAG."""
     if num_gates == 0:
-        return random.choice(variables)
+        return var(random.choice(variables))
     
     gate = random.choice(gates)
-    expr = '('
     
     if gate == 'not':
-        expr += f'{gate} {random_expression(variables, num_gates - 1)}'
-    else:
-        expr += f'{random_expression(variables, num_gates - 1)} {gate} {random_expression(variables, num_gates - 1)}'
+        return make_gate(gate, random_circuit(variables, num_gates - 1))
     
-    expr += ')'
-    return expr
+    # Split the remaining gate budget between the two inputs
+    left_gates = random.randint(0, num_gates - 1)
+    return make_gate(gate, random_circuit(variables, left_gates), random_circuit(variables, num_gates - 1 - left_gates))
+
+def random_expression(variables, num_gates):
+    """Generate a random logic expression with a given number of gates and variables."""
+    return str(random_circuit(variables, num_gates))
 
-def create_and_save_diagram(expression, file_path):
-    """Create a logic circuit diagram from the expression and save it as SVG."""
+def create_and_save_diagram(expression, file_path=None):
+    """Create a logic circuit diagram from the expression (string or circuit DAG) and return its SVG bytes.
+
+    The SVG is also saved to file_path when one is given.
+    """
     try:
-        d = logicparse(expression, outlabel=r'$\text{Output}$')
-        d.save(file_path)
+        # The diagram depends only on the expression text, so repeated circuits are drawn once
+        svg = cached_render('circuit', (str(expression),),
+                            lambda: drawing_svg(logicparse(str(expression), outlabel=r'$\text{Output}$')))
+        if file_path:
+            keep_image(svg, file_path)
+        return svg
     except Exception as e:
         print(f"Error creating diagram for expression '{expression}': {e}")
 
-def convert_svg_to_png(svg_path):
-    """Convert SVG file to PNG format with increased resolution."""
-    png_path = svg_path.replace('.svg', '.png')
-    # Increase scale to improve quality
-    cairosvg.svg2png(url=svg_path, write_to=png_path, scale=2.0)  # Scale factor increased to 2.0
-    return png_path
+def draw_gate(gate_type):
+    """SVG bytes of a single gate symbol."""
+    d = schemdraw.Drawing()
+    d.config(fontsize=8)
+    
+    if gate_type == 'AND':
+        gate = logic.And(inputs=2)
+        d += gate
+    elif gate_type == 'OR':
+        gate = logic.Or(inputs=2)
+        d += gate
+    elif gate_type == 'NAND':
+        gate = logic.Nand(inputs=2)
+        d += gate
+    elif gate_type == 'NOR':
+        gate = logic.Nor(inputs=2)
+        d += gate
+    elif gate_type == 'XOR':
+        gate = logic.Xor(inputs=2)
+        d += gate
+    elif gate_type == 'NOT':
+        gate = logic.Not()
+        d += gate
+    
+    return drawing_svg(d)
 
 def generate_simple_gate_operation_question():
-    """Generate a question involving a simple gate operation and save the gate image."""
+    """Generate a question involving a simple gate operation, with the gate image as SVG bytes."""
     gates = ['AND', 'OR', 'NOT', 'NAND', 'NOR', 'XOR']
     gate_type = random.choice(gates)
     
@@ -65,30 +99,8 @@ def generate_simple_gate_operation_question():
     elif gate_type == 'XOR':
         output = int(sum(input_values) % 2 == 1)
     
-    d = schemdraw.Drawing()
-    d.config(fontsize=8)
-    
-    if gate_type == 'AND':
-        gate = logic.And(inputs=2)
-        d += gate
-    elif gate_type == 'OR':
-        gate = logic.Or(inputs=2)
-        d += gate
-    elif gate_type == 'NAND':
-        gate = logic.Nand(inputs=2)
-        d += gate
-    elif gate_type == 'NOR':
-        gate = logic.Nor(inputs=2)
-        d += gate
-    elif gate_type == 'XOR':
-        gate = logic.Xor(inputs=2)
-        d += gate
-    elif gate_type == 'NOT':
-        gate = logic.Not()
-        d += gate
-    
-    svg_path = f'C:\\Users\\Lenovo\\OneDrive\\Desktop\\logicgates\\image\\{gate_type}_Gate.svg'
-    d.save(svg_path)
+    # Only six gate symbols exist, so each is drawn once and then served from the render cache
+    svg = cached_render('gate', (gate_type,), lambda: draw_gate(gate_type))
     
     options = ['0', '1']
     correct_answer = str(output)
@@ -102,14 +114,18 @@ def generate_simple_gate_operation_question():
     if gate_type == 'NOT':
         question = f"What is the output of the {gate_type} gate with input {input_values[0]}?"
     
-    return question, svg_path, options_text, correct_answer
+    return question, svg, options_text, correct_answer
+
+def create_pdf(questions_data, image_mode=None):
+    """Create a PDF with questions, options, SVG images, and correct answers.
 
-def create_pdf(questions_data):
-    """Create a PDF with questions, options, SVG images (converted to PNG), and correct answers."""
+    image_mode picks how the images are embedded: 'vector' draws the SVG
+    itself, 'raster' converts it to PNG in memory (imagepipe.IMAGE_MODE by default).
+    """
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
     
-    for i, (question, svg_paths, options_text, correct_answer) in enumerate(questions_data):
+    for i, (question, svgs, options_text, correct_answer) in enumerate(questions_data):
         pdf.add_page()
         pdf.set_font("Arial", size=12)
         
@@ -127,11 +143,12 @@ def create_pdf(questions_data):
         
         pdf.ln(5)
         
-        # Add images (converted from SVG to PNG)
-        for svg_path in svg_paths:
-            png_path = convert_svg_to_png(svg_path)
+        # Add images (straight from the SVG bytes, without touching the disk)
+        for svg in svgs:
+            if svg is None:
+                continue
             page_width = pdf.w - 2 * pdf.l_margin
-            pdf.image(png_path, x=pdf.l_margin, w=page_width)
+            add_svg(pdf, svg, mode=image_mode, x=pdf.l_margin, w=page_width)
             pdf.ln(5)
         
         # Add correct answer
@@ -155,28 +172,28 @@ def main():
     for _ in range(num_questions):
         if random.choice([True, False]):
             if random.random() < 0.5:
-                base_expr = random_expression(variables, random.randint(1, 3))
-                expr1 = base_expr
-                expr2 = base_expr
+                base_circuit = random_circuit(variables, random.randint(1, MAX_GATES))
+                circuit1 = base_circuit
+                circuit2 = base_circuit
             else:
-                base_expr = random_expression(variables, random.randint(1, 3))
-                expr1 = base_expr
-                expr2 = random_expression(variables, random.randint(1, 3))
-            
-            svg_path1 = f'C:\\Users\\Lenovo\\OneDrive\\Desktop\\logicgates\\image\\random_logic_circuit_{random.randint(1, 10000)}_1.svg'
-            svg_path2 = f'C:\\Users\\Lenovo\\OneDrive\\Desktop\\logicgates\\image\\random_logic_circuit_{random.randint(1, 10000)}_2.svg'
+                base_circuit = random_circuit(variables, random.randint(1, MAX_GATES))
+                circuit1 = base_circuit
+                circuit2 = random_circuit(variables, random.randint(1, MAX_GATES))
+            expr1 = str(circuit1)
+            expr2 = str(circuit2)
             
-            create_and_save_diagram(expr1, svg_path1)
-            create_and_save_diagram(expr2, svg_path2)
+            svg1 = create_and_save_diagram(circuit1)
+            svg2 = create_and_save_diagram(circuit2)
             
             question = f"Are these two circuits equivalent?\nExpression 1: {expr1}\nExpression 2: {expr2}"
             options_text = "Options:\n1. Yes\n2. No"
-            correct_answer = 'yes' if expr1 == expr2 else 'no'
+            equivalent, counterexample = check_equivalence(circuit1, circuit2, variables)
+            correct_answer = 'yes' if equivalent else f'no (outputs differ for {format_input(counterexample)})'
             
-            questions_data.append((question, [svg_path1, svg_path2], options_text, correct_answer))
+            questions_data.append((question, [svg1, svg2], options_text, correct_answer))
         else:
-            question, svg_path, options, correct_answer = generate_simple_gate_operation_question()
-            questions_data.append((question, [svg_path], options, correct_answer))
+            question, svg, options, correct_answer = generate_simple_gate_operation_question()
+            questions_data.append((question, [svg], options, correct_answer))
     
     create_pdf(questions_data)
 
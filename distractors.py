@@ -0,0 +1,86 @@
+import itertools
+import math
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from evaluator import VARIABLES
+from bitparallel import truth_table_signature
+from batcheval import packed_truth_tables, hamming_to
+from sampler import ChainSpace
+
+class TruthTableIndex:
+    """Distinct candidate functions stored as packed uint64 truth tables.
+
+    Each function keeps every candidate expression that computes it, so a
+    lookup can return any of them. Distances to a target function are
+    popcounts over the whole packed array.
+    """
+
+    def __init__(self, expressions, num_vars, variables=VARIABLES):
+        self.num_vars = num_vars
+        self.variables = variables
+        by_signature = {}
+        for expr in expressions:
+            by_signature.setdefault(truth_table_signature(expr, num_vars, variables), []).append(expr)
+        self.expressions = list(by_signature.values())
+        self.packed = packed_truth_tables([exprs[0] for exprs in self.expressions], num_vars, variables)
+
+    @classmethod
+    def from_space(cls, space):
+        """Index every expression of a sampler.ChainSpace."""
+        return cls((space.unrank(i) for i in range(space.size)), space.num_vars, space.variables)
+
+    def __len__(self):
+        return len(self.expressions)
+
+    def distances(self, expr):
+        target = packed_truth_tables([expr], self.num_vars, self.variables)[0]
+        return hamming_to(self.packed, target)
+
+    def neighbours(self, expr, distance):
+        """One expression for every indexed function exactly distance rows away from expr."""
+        return [random.choice(self.expressions[i]) for i in np.flatnonzero(self.distances(expr) == distance)]
+
+    def distractors(self, expr, count, distance=1):
+        """Up to count expressions for distinct functions that all differ from expr.
+
+        Functions exactly distance rows away come first, then ever closer or
+        further ones; ties are broken at random.
+        """
+        distances = self.distances(expr)
+        candidates = np.flatnonzero(distances > 0)
+        order = np.lexsort((np.random.random(len(candidates)), np.abs(distances[candidates] - distance)))
+        return [random.choice(self.expressions[i]) for i in candidates[order[:count]]]
+
+@lru_cache(maxsize=None)
+def chain_index(num_vars):
+    """Index of every finaltruthtable-style expression over the first num_vars variables."""
+    return TruthTableIndex.from_space(ChainSpace(VARIABLES[:num_vars]))
+
+def nearby_bit_patterns(values, count, distance=1):
+    """Up to count distinct 0/1 lists that differ from values, closest to distance flips first.
+
+    Unlike rejection sampling over all patterns this always terminates, and
+    it returns fewer than count patterns only when fewer exist.
+    """
+    patterns = []
+    distances = sorted(range(1, len(values) + 1), key=lambda k: (abs(k - distance), k))
+    for k in distances:
+        needed = count - len(patterns)
+        if math.comb(len(values), k) <= needed:
+            flips = list(itertools.combinations(range(len(values)), k))
+        else:
+            # More patterns exist than are needed, so random draws finish quickly
+            flips = set()
+            while len(flips) < needed:
+                flips.add(tuple(sorted(random.sample(range(len(values)), k))))
+        for positions in flips:
+            pattern = list(values)
+            for position in positions:
+                pattern[position] ^= 1
+            patterns.append(pattern)
+        if len(patterns) == count:
+            break
+    return patterns
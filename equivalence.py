@@ -0,0 +1,122 @@
+from evaluator import VARIABLES
+from exprparser import as_node
+from bitparallel import truth_table_signature
+
+# Up to this many variables, circuits are compared through their truth-table signatures;
+# beyond it a BDD is built instead of a 2^n-bit signature
+SIGNATURE_MAX_VARS = 12
+
+# Output of each binary gate for inputs (0, 0), (0, 1), (1, 0), (1, 1)
+GATE_TABLES = {
+    'and': (0, 0, 0, 1),
+    'or': (0, 1, 1, 1),
+    'xor': (0, 1, 1, 0),
+    'nand': (1, 1, 1, 0),
+    'nor': (1, 0, 0, 0),
+    'xnor': (1, 0, 0, 1),
+}
+
+class BDD:
+    """Reduced ordered binary decision diagram over a fixed variable order.
+
+    Nodes are integers: 0 and 1 are the terminals, every other node is an
+    index into self.nodes holding (level, low, high). Identical nodes are
+    shared through a unique table, so two functions are equal exactly when
+    their nodes are equal.
+    """
+
+    def __init__(self, variables):
+        self.variables = list(variables)
+        self.levels = {var: level for level, var in enumerate(self.variables)}
+        terminal_level = len(self.variables)
+        self.nodes = [(terminal_level, None, None), (terminal_level, None, None)]
+        self.unique = {}
+        self.apply_cache = {}
+
+    def node(self, level, low, high):
+        if low == high:
+            return low
+        key = (level, low, high)
+        if key not in self.unique:
+            self.unique[key] = len(self.nodes)
+            self.nodes.append(key)
+        return self.unique[key]
+
+    def var(self, name):
+        if name not in self.levels:
+            raise ValueError(f"Variable '{name}' is not one of {self.variables}")
+        return self.node(self.levels[name], 0, 1)
+
+    def apply(self, gate, u, v):
+        """Combine two nodes with a binary gate from GATE_TABLES."""
+        if u <= 1 and v <= 1:
+            return GATE_TABLES[gate][2 * u + v]
+        key = (gate, u, v)
+        if key in self.apply_cache:
+            return self.apply_cache[key]
+        level_u, low_u, high_u = self.nodes[u]
+        level_v, low_v, high_v = self.nodes[v]
+        level = min(level_u, level_v)
+        if level_u != level:
+            low_u = high_u = u
+        if level_v != level:
+            low_v = high_v = v
+        result = self.node(level, self.apply(gate, low_u, low_v), self.apply(gate, high_u, high_v))
+        self.apply_cache[key] = result
+        return result
+
+    def negate(self, u):
+        return self.apply('xor', u, 1)
+
+    def build(self, root):
+        """Build the node for an expression DAG, visiting every shared node once."""
+        built = {}
+        for node in root.postorder():
+            if node.op == 'var':
+                built[node] = self.var(node.args[0])
+            elif node.op == 'const':
+                built[node] = node.args[0]
+            elif node.op == 'not':
+                built[node] = self.negate(built[node.args[0]])
+            else:
+                built[node] = self.apply(node.op, built[node.args[0]], built[node.args[1]])
+        return built[root]
+
+    def satisfying_input(self, u):
+        """Return one assignment {variable: 0/1} that makes u true, or None if u is false."""
+        if u == 0:
+            return None
+        assignment = {var: 0 for var in self.variables}
+        while u > 1:
+            level, low, high = self.nodes[u]
+            if low != 0:
+                u = low
+            else:
+                assignment[self.variables[level]] = 1
+                u = high
+        return assignment
+
+def check_equivalence(expr1, expr2, variables=VARIABLES):
+    """Decide whether two expressions (text or Node) compute the same function of the given variables.
+
+    Returns (equivalent, counterexample) where counterexample is None when
+    they are equivalent and otherwise one input {variable: 0/1} on which the
+    two expressions differ.
+    """
+    variables = list(variables)
+    num_vars = len(variables)
+    if num_vars <= SIGNATURE_MAX_VARS:
+        difference = (truth_table_signature(expr1, num_vars, variables)
+                      ^ truth_table_signature(expr2, num_vars, variables))
+        if not difference:
+            return True, None
+        row = (difference & -difference).bit_length() - 1
+        return False, {var: row >> (num_vars - 1 - i) & 1 for i, var in enumerate(variables)}
+
+    bdd = BDD(variables)
+    difference = bdd.apply('xor', bdd.build(as_node(expr1)), bdd.build(as_node(expr2)))
+    return difference == 0, bdd.satisfying_input(difference)
+
+def format_input(assignment):
+    """Render an input assignment such as 'a=0, b=1'."""
+    return ', '.join(f'{var}={value}' for var, value in assignment.items())
@@ -0,0 +1,50 @@
+from functools import lru_cache
+
+from exprparser import as_node
+
+# Variable names that may appear in an expression, in truth-table column order
+VARIABLES = 'ABCDEF'
+
+# Maximum number of compiled expressions kept in memory (least recently used are dropped)
+CACHE_SIZE = 4096
+
+# Python code for each gate applied to the local names of its operands
+GATE_CODE = {
+    'not': 'not {0}',
+    'and': '{0} and {1}',
+    'or': '{0} or {1}',
+    'nand': 'not ({0} and {1})',
+    'nor': 'not ({0} or {1})',
+    'xor': '{0} != {1}',
+    'xnor': '{0} == {1}',
+}
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(expr, variables=VARIABLES):
+    """Parse and compile a logical expression (text or Node) once into a callable.
+
+    The callable takes one 0/1 value per variable, either positionally in
+    column order or by name, and returns the boolean result. Every distinct
+    node of the expression is computed once per call.
+    """
+    root = as_node(expr)
+    names = {}
+    lines = []
+    for node in root.postorder():
+        if node.op == 'var':
+            names[node] = node.args[0]
+        elif node.op == 'const':
+            names[node] = str(node.args[0])
+        else:
+            names[node] = f'_{len(lines)}'
+            code = GATE_CODE[node.op].format(*(names[child] for child in node.args))
+            lines.append(f'    {names[node]} = {code}')
+    params = ', '.join(f'{var}=0' for var in variables)
+    source = '\n'.join([f'def evaluate({params}):'] + lines + [f'    return bool({names[root]})'])
+    namespace = {'__builtins__': {'bool': bool}}
+    exec(compile(source, '<expression>', 'exec'), namespace)
+    return namespace['evaluate']
+
+def evaluate_expression(expr, *values):
+    """Evaluate an expression for one row of 0/1 values given in column order."""
+    return compile_expression(expr)(*values)
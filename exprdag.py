@@ -0,0 +1,102 @@
+import weakref
+
+# Binding strength of every operator, loosest first; the parser and printers share it
+PRECEDENCE = {'xor': 1, 'xnor': 1, 'or': 2, 'nor': 2, 'and': 3, 'nand': 3, 'not': 4, 'var': 5, 'const': 5}
+BINARY_GATES = ('and', 'or', 'nand', 'nor', 'xor', 'xnor')
+
+# Expression dialects understood by format_expression:
+#   'python'     fully parenthesised and/or/not as in finaltruthtable.py, e.g. (A) and (not (B))
+#   'plain'      minimal parentheses as in missing.py, e.g. not (A and not B or C)
+#   'logicparse' one pair of parentheses per gate as in combine.py, e.g. ((a nand b) xor (not c))
+DIALECTS = ('python', 'plain', 'logicparse')
+
+class Node:
+    """Interned logic expression node.
+
+    Nodes are hash-consed: building the same operator over the same children
+    always returns the same object, so identical subcircuits are stored once
+    and nodes can be compared and hashed by identity.
+
+    op is 'var', 'const', 'not' or a binary gate name; args holds the
+    variable name, the constant 0/1, or the child nodes.
+    """
+
+    __slots__ = ('op', 'args', '_text', '__weakref__')
+
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, op, *args):
+        key = (op, args)
+        node = cls._interned.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            node.op = op
+            node.args = args
+            node._text = None
+            cls._interned[key] = node
+        return node
+
+    def __repr__(self):
+        return f'Node({self})'
+
+    def __str__(self):
+        """Fully parenthesised expression, as produced by combine.random_expression."""
+        if self._text is None:
+            self._text = format_expression(self, 'logicparse')
+        return self._text
+
+    def children(self):
+        return self.args if self.op not in ('var', 'const') else ()
+
+    def postorder(self):
+        """Yield every distinct node of the DAG once, children before parents."""
+        seen = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+            elif node not in seen:
+                seen.add(node)
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children()) if child not in seen)
+
+    def gate_count(self):
+        """Number of distinct gates in the DAG."""
+        return sum(1 for node in self.postorder() if node.op not in ('var', 'const'))
+
+def var(name):
+    return Node('var', name)
+
+def const(value):
+    return Node('const', int(value))
+
+def gate(op, *inputs):
+    return Node(op, *inputs)
+
+def format_expression(root, dialect='logicparse'):
+    """Print an expression DAG in one of DIALECTS, visiting every shared node once."""
+    if dialect not in DIALECTS:
+        raise ValueError(f"Unknown dialect '{dialect}', expected one of {DIALECTS}")
+    texts = {}
+    for node in root.postorder():
+        if node.op in ('var', 'const'):
+            texts[node] = str(node.args[0])
+            continue
+        if dialect == 'python' and node.op not in ('and', 'or', 'not'):
+            raise ValueError(f"Gate '{node.op}' cannot be written in the python dialect")
+        operands = [texts[child] for child in node.args]
+        if dialect == 'logicparse':
+            operands = [f'{node.op} {operands[0]}'] if node.op == 'not' else operands
+            texts[node] = f'({f" {node.op} ".join(operands)})'
+            continue
+        if dialect == 'python':
+            operands = [f'({text})' for text in operands]
+        else:
+            # Parenthesise only operands that bind more loosely than this gate;
+            # binary gates are left-associative, so the right operand also needs them on a tie
+            for i, child in enumerate(node.args):
+                if PRECEDENCE[child.op] < PRECEDENCE[node.op] + (i == 1):
+                    operands[i] = f'({operands[i]})'
+        texts[node] = f'not {operands[0]}' if node.op == 'not' else f' {node.op} '.join(operands)
+    return texts[root]
@@ -1,11 +1,16 @@
-import itertools
 import random
 import os
-import schemdraw
-from schemdraw.logic import table
 from fpdf import FPDF
 import time
-import cairosvg
+from bitparallel import truth_table_signature, signature_rows
+from expressionset import ExpressionSet
+from sampler import ChainSpace, ExpressionSpaceExhausted, check_capacity, draw_new_expression
+from distractors import chain_index
+from imagepipe import truth_table_svg
+from pdftable import truth_table_headers, table_cells, table_width, draw_truth_table
+
+# Preferred number of truth-table rows on which a wrong option differs from the answer
+DISTRACTOR_DISTANCE = 2
 
 # Directory to save truth table PDFs and images
 pdf_directory = r'C:\Users\Lenovo\OneDrive\Desktop\logicgates\pdf'
@@ -17,68 +22,23 @@ os.makedirs(image_directory, exist_ok=True)
 
 # Function to generate random logical expressions with a given set of variables
 def generate_random_expression(variables):
-    operators = ['and', 'or']
-    num_operators = random.randint(1, 3)  # Choose between 1 to 3 operators for complexity
-    expression = random.choice(variables)
-    
-    for _ in range(num_operators):
-        op = random.choice(operators)
-        expr = random.choice(variables)
-        if random.choice([True, False]):
-            expr = f'not ({expr})'
-        expression = f'({expression}) {op} ({expr})'
-    
-    return expression
-
-# Function to evaluate logical expressions
-def evaluate_expression(expr, *values):
-    # Map variable names to their corresponding values
-    variables = 'ABCDE'
-    for i, value in enumerate(values):
-        expr = expr.replace(variables[i], str(value))
-    return eval(expr.replace('and', ' and ').replace('or', ' or ').replace('not', ' not '))
-
-# Function to generate the truth table
-def generate_truth_table_image(expr, save_path, num_vars):
-    headers = [chr(65 + i) for i in range(num_vars)]  # Generate headers A, B, C, etc.
-    headers.append('Q')
-    
-    table_str = " | ".join(headers) + "\n"
-    table_str += "|".join(["---"] * (num_vars + 1)) + "\n"
-    
-    for values in itertools.product([0, 1], repeat=num_vars):
-        Q = evaluate_expression(expr, *values)
-        table_str += " | ".join(map(str, values)) + f" | {int(Q)}\n"
-    
-    # Generate the truth table image using schemdraw
-    colfmt = 'c|' * (num_vars + 1)
-    tbl_schem = table.Table(table=table_str.strip(), colfmt=colfmt)
-    d = schemdraw.Drawing()
-    d += tbl_schem
-    d.save(save_path)
-    print(f"Truth table saved as {save_path}")
-
-# Function to convert SVG to PNG without reducing image quality
-def convert_svg_to_png(svg_path, png_path):
-    # Retain the resolution while converting to PNG
-    with open(svg_path, "rb") as svg_file:
-        svg_data = svg_file.read()
-    png_data = cairosvg.svg2png(bytestring=svg_data, scale=2.0)  # Scaling to maintain quality
-    with open(png_path, "wb") as png_file:
-        png_file.write(png_data)
+    # Uniform over every expression with 1 to 3 operators
+    return ChainSpace(variables).random()
+
+# Function to generate the truth table rows of an expression
+def generate_truth_table(expr, num_vars):
+    return signature_rows(truth_table_signature(expr, num_vars), num_vars)
 
 # Function to generate a PDF with questions and answers
-def generate_pdf(questions, answers, correct_answers, original_options):
+# answers holds each question's truth table rows, drawn natively on the page;
+# keep_images also saves every table as an SVG drawn by schemdraw
+def generate_pdf(questions, answers, correct_answers, original_options, keep_images=False):
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
 
     num_questions_per_page = 2
     num_pages = (len(questions) + num_questions_per_page - 1) // num_questions_per_page
 
-    # Standard image size for consistency
-    image_width = 60  # Width of image in mm
-    image_height = 80  # Height of image in mm
-
     for page_num in range(num_pages):
         pdf.add_page()
         pdf.set_font("Arial", 'B', 16)
@@ -97,27 +57,31 @@ def generate_pdf(questions, answers, correct_answers, original_options):
             pdf.multi_cell(0, 10, txt=question_text, align='L')
             pdf.ln(5)
 
-            # Convert SVG to PNG
-            png_path = os.path.join(image_directory, f'truth_table_{question_idx}.png')
-            convert_svg_to_png(answers[i], png_path)
-
-            # Calculate position for image and text
+            # The table sits on the right, the options to its left
+            num_vars = len(answers[i][0][0])
+            headers = truth_table_headers(num_vars)
+            table_x = pdf.w - table_width(len(headers)) - 20
+            text_width = table_x - pdf.l_margin - 10
             y_start = pdf.get_y()
-            pdf.image(png_path, x=pdf.w - image_width - 20, y=y_start, w=image_width, h=image_height)
+            if keep_images:
+                truth_table_svg(answers[i], num_vars, os.path.join(image_directory, f'truth_table_{question_idx}.svg'))
 
             # Add options for expressions on the left side
             pdf.set_font("Arial", 'B', 12)
-            pdf.multi_cell(pdf.w - image_width - 30, 10, txt="Options", align='L')
+            pdf.multi_cell(text_width, 10, txt="Options", align='L')
             
             options = original_options[i]
             pdf.set_font("Arial", size=12)
 
             for idx, option in enumerate(options, 1):
-                pdf.multi_cell(pdf.w - image_width - 30, 10, txt=f"({idx}) {option}", align='L')
+                pdf.multi_cell(text_width, 10, txt=f"({idx}) {option}", align='L')
                 pdf.ln(1)
+            text_end, page = pdf.get_y(), pdf.page
 
-            # Move to the next line with additional spacing
-            pdf.ln(image_height + 1)  # Adjust spacing between questions
+            # Draw the table; a long one continues on the next page and the next question follows it
+            table_end = draw_truth_table(pdf, headers, table_cells(answers[i]), x=table_x, y=y_start)
+            pdf.set_y(max(table_end, text_end) if pdf.page == page else table_end)
+            pdf.ln(10)  # Adjust spacing between questions
 
     # Adding the answer section at the end
     pdf.add_page()
@@ -146,33 +110,38 @@ def main():
     answers = []
     correct_answers = []
     original_options = []
-    generated_expressions = set()  # Set to track generated expressions
+    generated_expressions = ExpressionSet()  # Track the functions already asked about
+
+    # Functions over 2 or 3 variables are drawn without replacement, so asking for
+    # more questions than exist fails with a clear error instead of retrying forever
+    samplers = {num_vars: ChainSpace([chr(65 + i) for i in range(num_vars)]).function_sampler(generated_expressions)
+                for num_vars in (2, 3)}
+    try:
+        check_capacity(samplers, num_questions)
+    except ExpressionSpaceExhausted as e:
+        print(e)
+        return
 
     for i in range(num_questions):
-        # Randomly choose the number of variables for this question (2 to 3)
-        num_vars = random.choice([2, 3])
-
-        # Generate a unique random expression
-        while True:
-            variables = [chr(65 + i) for i in range(num_vars)]
-            expr = generate_random_expression(variables)
-            if expr not in generated_expressions:
-                generated_expressions.add(expr)
-                break
+        # Draw a random expression for a function not asked about yet
+        try:
+            num_vars, expr = draw_new_expression(samplers, generated_expressions)
+        except ExpressionSpaceExhausted as e:
+            print(f"Only {len(questions)} unique questions could be generated: {e}")
+            return
 
         questions.append(expr)
         correct_answers.append(expr)
 
-        # Generate options including the correct one
-        options = [generate_random_expression(['A', 'B', 'C']) for _ in range(3)]
+        # Generate options including the correct one; the wrong options are looked up as
+        # distinct functions of the table's own variables that differ from the answer
+        options = chain_index(num_vars).distractors(expr, 3, DISTRACTOR_DISTANCE)
         options.append(expr)
         random.shuffle(options)
         original_options.append(options)  # Store the options for later use
 
-        # Generate and save the truth table image
-        svg_path = os.path.join(image_directory, f'truth_table_{i+1}.svg')
-        generate_truth_table_image(expr, svg_path, num_vars)
-        answers.append(svg_path)
+        # The table is drawn straight onto the PDF page
+        answers.append(generate_truth_table(expr, num_vars))
 
     # Ask if the user wants to generate a PDF
     create_pdf = input("Do you want to create a PDF with the questions and answers? (yes/no): ").strip().lower()
@@ -0,0 +1,96 @@
+from functools import lru_cache
+import itertools
+
+from evaluator import CACHE_SIZE, VARIABLES
+from bitparallel import truth_table_signature
+
+# How two expressions are considered duplicates:
+#   'function'     same truth table
+#   'permutation'  same truth table after reordering the input variables
+#   'npn'          same truth table after reordering and negating inputs and/or negating the output
+MODES = ('function', 'permutation', 'npn')
+
+@lru_cache(maxsize=None)
+def row_maps(num_vars, negate_inputs):
+    """Row index maps for every permutation (and optionally negation) of the inputs.
+
+    Applying map m to a signature gives the table whose row r takes its
+    output from row m[r] of the original.
+    """
+    maps = []
+    negations = range(1 << num_vars) if negate_inputs else [0]
+    for perm in itertools.permutations(range(num_vars)):
+        for negation in negations:
+            row_map = []
+            for row in range(1 << num_vars):
+                source = 0
+                for i in range(num_vars):
+                    bit = (row >> (num_vars - 1 - perm[i]) & 1) ^ (negation >> i & 1)
+                    source |= bit << (num_vars - 1 - i)
+                row_map.append(source)
+            maps.append(tuple(row_map))
+    return tuple(maps)
+
+def transform_signature(signature, row_map):
+    """Reorder the rows of a signature with a map from row_maps."""
+    result = 0
+    for row, source in enumerate(row_map):
+        if signature >> source & 1:
+            result |= 1 << row
+    return result
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical_signature(signature, num_vars, mode='function'):
+    """Smallest signature in the class of functions equivalent to signature under mode."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {MODES}")
+    if mode == 'function':
+        return signature
+    full = (1 << (1 << num_vars)) - 1
+    canonical = signature
+    for row_map in row_maps(num_vars, mode == 'npn'):
+        transformed = transform_signature(signature, row_map)
+        canonical = min(canonical, transformed, full ^ transformed if mode == 'npn' else transformed)
+    return canonical
+
+class ExpressionSet:
+    """Set of expressions deduplicated by the function they compute rather than their text.
+
+    Membership is a single dictionary lookup on the canonical truth-table
+    signature, so adding to a large question bank needs no pairwise
+    comparisons. Items are (expression, num_vars) pairs because the same
+    expression gives a different table over a different number of variables.
+    """
+
+    def __init__(self, mode='function', variables=VARIABLES):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}', expected one of {MODES}")
+        self.mode = mode
+        self.variables = variables
+        self.expressions = {}
+
+    def key(self, expr, num_vars):
+        signature = truth_table_signature(expr, num_vars, self.variables)
+        return (num_vars, canonical_signature(signature, num_vars, self.mode))
+
+    def add(self, expr, num_vars):
+        """Add an expression; returns False if an equivalent one was already present."""
+        key = self.key(expr, num_vars)
+        if key in self.expressions:
+            return False
+        self.expressions[key] = expr
+        return True
+
+    def __contains__(self, item):
+        expr, num_vars = item
+        return self.key(expr, num_vars) in self.expressions
+
+    def keys(self):
+        """Keys (num_vars, canonical signature) of the functions in the set."""
+        return self.expressions.keys()
+
+    def __len__(self):
+        return len(self.expressions)
+
+    def __iter__(self):
+        return iter(self.expressions.values())
@@ -0,0 +1,75 @@
+import re
+from functools import lru_cache
+
+from exprdag import Node, PRECEDENCE, BINARY_GATES, var, const, gate
+
+# Maximum number of parsed expression texts kept in memory
+PARSE_CACHE_SIZE = 4096
+
+KEYWORDS = set(BINARY_GATES) | {'not'}
+
+TOKEN_PATTERN = re.compile(r'\s*(?:([()01])|([A-Za-z_]\w*)|(\S))')
+
+def tokenize(expr):
+    """Split an expression into parentheses, constants, keywords and variable names."""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(expr):
+        symbol, word, other = match.groups()
+        if other:
+            raise ValueError(f"Unexpected character '{other}' in expression '{expr}'")
+        if symbol or word:
+            tokens.append(symbol or word)
+    return tokens
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_expression(expr):
+    """Parse an expression in any of the exprdag.DIALECTS into an interned Node.
+
+    Operator precedence follows schemdraw's logicparse: not binds tightest,
+    then and/nand, then or/nor, then xor/xnor; binary gates are
+    left-associative. For and/or/not this is the same as Python's.
+    """
+    tokens = tokenize(expr)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def advance():
+        nonlocal position
+        token = peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of expression '{expr}'")
+        position += 1
+        return token
+
+    def parse_operand():
+        token = advance()
+        if token == 'not':
+            return gate('not', parse_operand())
+        if token == '(':
+            node = parse_binary(1)
+            if advance() != ')':
+                raise ValueError(f"Missing ')' in expression '{expr}'")
+            return node
+        if token in ('0', '1'):
+            return const(token)
+        if token == ')' or token in KEYWORDS:
+            raise ValueError(f"Unexpected '{token}' in expression '{expr}'")
+        return var(token)
+
+    def parse_binary(min_precedence):
+        node = parse_operand()
+        while peek() in BINARY_GATES and PRECEDENCE[peek()] >= min_precedence:
+            op = advance()
+            node = gate(op, node, parse_binary(PRECEDENCE[op] + 1))
+        return node
+
+    root = parse_binary(1)
+    if peek() is not None:
+        raise ValueError(f"Unexpected '{peek()}' in expression '{expr}'")
+    return root
+
+def as_node(expr):
+    """Return expr unchanged if it is already a Node, otherwise parse it."""
+    return expr if isinstance(expr, Node) else parse_expression(expr)
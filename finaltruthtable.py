@@ -1,11 +1,17 @@
-import itertools
 import random
 import os
-import schemdraw
-from schemdraw.logic import table
 from fpdf import FPDF
 import time
-import cairosvg
+from bitparallel import truth_table_signature, signature_rows
+from expressionset import ExpressionSet
+from sampler import ChainSpace, ExpressionSpaceExhausted, check_capacity, draw_new_expression
+from imagepipe import truth_table_svg
+from pdftable import truth_table_headers, table_cells, table_width, draw_truth_table
+
+# Range of rows on which a false question's table disagrees with its expression;
+# fewer wrong rows make the mistake harder to spot
+MIN_WRONG_ROWS = 1
+MAX_WRONG_ROWS = 2
 
 # Directory to save truth table PDFs and images
 pdf_directory = r'C:\Users\Lenovo\OneDrive\Desktop\logicgates\pdf'
@@ -15,99 +21,30 @@ image_directory = r'C:\Users\Lenovo\OneDrive\Desktop\logicgates\Truthtable'
 os.makedirs(pdf_directory, exist_ok=True)
 os.makedirs(image_directory, exist_ok=True)
 
-# Function to generate random logical expressions with a given set of variables
-def generate_random_expression(variables, existing_expressions):
-    operators = ['and', 'or']
-    num_operators = random.randint(1, 3)  # Choose between 1 to 3 operators for complexity
-    expression = random.choice(variables)
-    
-    for _ in range(num_operators):
-        op = random.choice(operators)
-        expr = random.choice(variables)
-        if random.choice([True, False]):
-            expr = f'not ({expr})'
-        expression = f'({expression}) {op} ({expr})'
-    
-    # Ensure unique expression
-    if expression in existing_expressions:
-        existing_expressions.add(expression)  # Add the current expression to avoid infinite loop
-        return generate_random_expression(variables, existing_expressions)
-    
-    existing_expressions.add(expression)
-    return expression
-
-# Function to evaluate logical expressions
-def evaluate_expression(expr, *values):
-    # Map variable names to their corresponding values
-    variables = 'ABCDE'
-    for i, value in enumerate(values):
-        expr = expr.replace(variables[i], str(value))
-    return eval(expr.replace('and', ' and ').replace('or', ' or ').replace('not', ' not '))
+# Expression space for each number of variables a question may use (2 to 3)
+expression_spaces = {num_vars: ChainSpace([chr(65 + i) for i in range(num_vars)]) for num_vars in (2, 3)}
 
 # Function to generate the truth table
 def generate_truth_table(expr, num_vars):
-    truth_table = []
-    for values in itertools.product([0, 1], repeat=num_vars):
-        Q = evaluate_expression(expr, *values)
-        truth_table.append((values, Q))
-    return truth_table
-
-# Function to check if the expression matches the truth table
-def does_truth_table_match_expression(expr, truth_table):
-    for values, expected in truth_table:
-        actual = evaluate_expression(expr, *values)
-        if actual != expected:
-            return False
-    return True
-
-# Function to generate the truth table image
-def generate_truth_table_image(truth_table, save_path, num_vars):
-    headers = [chr(65 + i) for i in range(num_vars)]  # Generate headers A, B, C, etc.
-    headers.append('Q')
-    
-    # Create table string
-    table_str = " | ".join(headers) + "\n"
-    table_str += "|".join(["---"] * (num_vars + 1)) + "\n"
-    
-    for values, Q in truth_table:
-        table_str += " | ".join(map(str, values)) + f" | {int(Q)}\n"
-    
-    # Ensure the column format matches the number of columns
-    colfmt = 'c|' * (num_vars + 1)
-    
-    try:
-        # Generate the truth table image using schemdraw
-        tbl_schem = table.Table(table=table_str.strip(), colfmt=colfmt)
-        d = schemdraw.Drawing()
-        d += tbl_schem
-        d.save(save_path)
-        print(f"Truth table saved as {save_path}")
-    except Exception as e:
-        print(f"Error generating truth table image: {e}")
-        print(f"Table String:\n{table_str}")
-        print(f"Column Format: {colfmt}")
-
-# Function to convert SVG to PNG without reducing image quality
-def convert_svg_to_png(svg_path, png_path):
-    # Retain the resolution while converting to PNG
-    with open(svg_path, "rb") as svg_file:
-        svg_data = svg_file.read()
-    png_data = cairosvg.svg2png(bytestring=svg_data, scale=2.0)  # Scaling to maintain quality
-    with open(png_path, "wb") as png_file:
-        png_file.write(png_data)
+    # All rows come from one bit-parallel evaluation of the expression
+    return signature_rows(truth_table_signature(expr, num_vars), num_vars)
+
+# Function to generate a truth table that disagrees with the expression on exactly num_wrong_rows rows
+def generate_false_truth_table(expr, num_vars, num_wrong_rows):
+    wrong_rows = random.sample(range(2 ** num_vars), num_wrong_rows)
+    flipped = sum(1 << row for row in wrong_rows)
+    return signature_rows(truth_table_signature(expr, num_vars) ^ flipped, num_vars)
 
 # Function to generate a PDF with questions and answers
-def generate_pdf(questions, answers, correct_answers):
+# answers holds each question's truth table rows, drawn natively on the page;
+# keep_images also saves every table as an SVG drawn by schemdraw
+def generate_pdf(questions, answers, correct_answers, keep_images=False):
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
 
     num_questions_per_page = 2
     num_pages = (len(questions) + num_questions_per_page - 1) // num_questions_per_page
 
-    # Standard image size for consistency
-    image_width = 60  # Width of image in mm
-    image_height = 80  # Height of image in mm
-
     for page_num in range(num_pages):
         pdf.add_page()
         pdf.set_font("Arial", 'B', 16)
@@ -126,26 +63,30 @@ def generate_pdf(questions, answers, correct_answers):
             pdf.multi_cell(0, 10, txt=question_text, align='L')
             pdf.ln(5)
 
-            # Convert SVG to PNG
-            png_path = os.path.join(image_directory, f'truth_table_{question_idx}.png')
-            convert_svg_to_png(answers[i], png_path)
-
-            # Calculate position for image and text
+            # The table sits on the right, the text to its left
+            num_vars = len(answers[i][0][0])
+            headers = truth_table_headers(num_vars)
+            table_x = pdf.w - table_width(len(headers)) - 20
+            text_width = table_x - pdf.l_margin - 10
             y_start = pdf.get_y()
-            pdf.image(png_path, x=pdf.w - image_width - 20, y=y_start, w=image_width, h=image_height)
+            if keep_images:
+                truth_table_svg(answers[i], num_vars, os.path.join(image_directory, f'truth_table_{question_idx}.svg'))
 
             # Add the expression on the left side
             pdf.set_font("Arial", 'B', 12)
-            pdf.multi_cell(pdf.w - image_width - 30, 10, txt=f"Expression: {questions[i]}", align='L')
+            pdf.multi_cell(text_width, 10, txt=f"Expression: {questions[i]}", align='L')
             
             # Add options for true/false
             pdf.set_font("Arial", size=12)
-            pdf.multi_cell(pdf.w - image_width - 30, 10, txt="Options", align='L')
-            pdf.multi_cell(pdf.w - image_width - 30, 10, txt="1. True", align='L')
-            pdf.multi_cell(pdf.w - image_width - 30, 10, txt="2. False", align='L')
+            pdf.multi_cell(text_width, 10, txt="Options", align='L')
+            pdf.multi_cell(text_width, 10, txt="1. True", align='L')
+            pdf.multi_cell(text_width, 10, txt="2. False", align='L')
+            text_end, page = pdf.get_y(), pdf.page
 
-            # Move to the next line with additional spacing
-            pdf.ln(image_height + 1)  # Adjust spacing between questions
+            # Draw the table; a long one continues on the next page and the next question follows it
+            table_end = draw_truth_table(pdf, headers, table_cells(answers[i]), x=table_x, y=y_start)
+            pdf.set_y(max(table_end, text_end) if pdf.page == page else table_end)
+            pdf.ln(10)  # Adjust spacing between questions
 
     # Adding the answer section at the end
     pdf.add_page()
@@ -175,48 +116,56 @@ def main():
     questions = []
     answers = []
     correct_answers = []
-    existing_expressions = set()
+    existing_expressions = ExpressionSet()
+    
+    # Functions are drawn without replacement; asking for more questions than
+    # the expression space holds fails here instead of recursing forever
+    samplers = {num_vars: space.function_sampler(existing_expressions)
+                for num_vars, space in expression_spaces.items()}
+    try:
+        check_capacity(samplers, num_questions)
+    except ExpressionSpaceExhausted as e:
+        print(e)
+        return
 
     # Generate true questions
     while len(correct_answers) < (num_questions - num_false_questions):
-        # Randomly choose the number of variables for this question (2 to 3)
-        num_vars = random.choice([2, 3])
-        variables = [chr(65 + i) for i in range(num_vars)]
-        expr = generate_random_expression(variables, existing_expressions)
+        # Draw an expression for a new function over 2 or 3 variables
+        try:
+            num_vars, expr = draw_new_expression(samplers, existing_expressions)
+        except ExpressionSpaceExhausted as e:
+            print(f"Only {len(questions)} unique questions could be generated: {e}")
+            return
         
-        # Generate and check the truth table
+        # The expression's own truth table always matches it
         truth_table = generate_truth_table(expr, num_vars)
         
-        if does_truth_table_match_expression(expr, truth_table):
-            # Save the truth table image
-            svg_path = os.path.join(image_directory, f'truth_table_{len(correct_answers) + 1}.svg')
-            generate_truth_table_image(truth_table, svg_path, num_vars)
-            answers.append(svg_path)
-            
-            # The expression matches the truth table
-            correct_answers.append(True)
-            questions.append(expr)
+        # The table is drawn straight onto the PDF page
+        answers.append(truth_table)
+        
+        # The expression matches the truth table
+        correct_answers.append(True)
+        questions.append(expr)
 
     # Generate false questions
     while len(correct_answers) < num_questions:
-        # Randomly choose the number of variables for this question (2 to 3)
-        num_vars = random.choice([2, 3])
-        variables = [chr(65 + i) for i in range(num_vars)]
-        expr = generate_random_expression(variables, existing_expressions)
+        # Draw an expression for a new function over 2 or 3 variables
+        try:
+            num_vars, expr = draw_new_expression(samplers, existing_expressions)
+        except ExpressionSpaceExhausted as e:
+            print(f"Only {len(questions)} unique questions could be generated: {e}")
+            return
         
-        # Generate a valid truth table with a different expression
-        valid_expr = generate_random_expression(variables, existing_expressions)
-        truth_table = generate_truth_table(valid_expr, num_vars)
+        # Build a mismatching table directly by flipping a few rows of the expression's own table
+        num_wrong_rows = random.randint(MIN_WRONG_ROWS, MAX_WRONG_ROWS)
+        truth_table = generate_false_truth_table(expr, num_vars, num_wrong_rows)
         
-        if not does_truth_table_match_expression(expr, truth_table):
-            # Save the truth table image
-            svg_path = os.path.join(image_directory, f'truth_table_{len(correct_answers) + 1}.svg')
-            generate_truth_table_image(truth_table, svg_path, num_vars)
-            answers.append(svg_path)
-            
-            # The expression does not match the truth table
-            correct_answers.append(False)
-            questions.append(expr)
+        # The table is drawn straight onto the PDF page
+        answers.append(truth_table)
+        
+        # The expression does not match the truth table
+        correct_answers.append(False)
+        questions.append(expr)
 
     # Generate the PDF with the questions and answers
     generate_pdf(questions, answers, correct_answers)
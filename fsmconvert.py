@@ -0,0 +1,106 @@
+import random
+from collections import deque
+
+import numpy as np
+
+from fsmmin import TableMachine, minimize
+from fsmsim import simulate
+
+def mealy_to_moore(machine, initial_output=0):
+    """Moore machine with the same output stream as a Mealy machine, in O(states * symbols).
+
+    Each Moore state is a (Mealy state, output) pair reached by some
+    transition, found breadth first from (start, initial_output); it
+    outputs the output of the transition that entered it. origins lists
+    the pair behind every new state.
+    """
+    k = len(machine.alphabet)
+    number = {(0, initial_output): 0}
+    origins = [(0, initial_output)]
+    transitions = []
+    for state, _ in origins:
+        for symbol in range(k):
+            pair = (machine.transitions[state * k + symbol], machine.mealy_outputs[state * k + symbol])
+            if pair not in number:
+                number[pair] = len(origins)
+                origins.append(pair)
+            transitions.append(number[pair])
+    moore = TableMachine(transitions, [output for _, output in origins], 'moore', machine.alphabet)
+    moore.origins = origins
+    return moore
+
+def moore_to_mealy(machine):
+    """Mealy machine with the same output stream as a Moore machine: each transition outputs its target's output."""
+    outputs = [machine.moore_outputs[next_state] for next_state in machine.transitions]
+    return TableMachine(machine.transitions, outputs, 'mealy', machine.alphabet)
+
+def _step_outputs(machine, model, state):
+    """Next states and the output produced on each symbol from a state."""
+    k = len(machine.alphabet)
+    next_states = machine.transitions[state * k:(state + 1) * k]
+    if model == 'mealy':
+        return next_states, machine.mealy_outputs[state * k:(state + 1) * k]
+    return next_states, [machine.moore_outputs[next_state] for next_state in next_states]
+
+def check_conversion(machine1, model1, machine2, model2):
+    """Whether two machines, each Mealy or Moore, give the same output stream on every input stream.
+
+    Walks the product automaton breadth first, as fsmmin does for machines
+    of one model, and returns (same, counterexample): the shortest input on
+    which the output streams differ, or None.
+    """
+    if machine1.alphabet != machine2.alphabet:
+        raise ValueError("Machines over different alphabets cannot be compared")
+    seen = {(0, 0): None}
+    queue = deque([(0, 0)])
+    while queue:
+        pair = queue.popleft()
+        next1, outputs1 = _step_outputs(machine1, model1, pair[0])
+        next2, outputs2 = _step_outputs(machine2, model2, pair[1])
+        for symbol in range(len(machine1.alphabet)):
+            if outputs1[symbol] != outputs2[symbol]:
+                path = [machine1.alphabet[symbol]]
+                while seen[pair] is not None:
+                    pair, previous_symbol = seen[pair]
+                    path.append(machine1.alphabet[previous_symbol])
+                return False, ''.join(reversed(path))
+            following = (next1[symbol], next2[symbol])
+            if following not in seen:
+                seen[following] = (pair, symbol)
+                queue.append(following)
+    return True, None
+
+def same_output_stream(machine1, model1, machine2, model2, streams):
+    """Run both machines over the same input streams with fsmsim and compare the outputs step by step."""
+    _, outputs1 = simulate(machine1, streams, model1)
+    _, outputs2 = simulate(machine2, streams, model2)
+    return bool(np.array_equal(outputs1, outputs2))
+
+def convert(machine, model):
+    """The machine in the other model, checked to give the same output stream."""
+    converted = mealy_to_moore(machine) if model == 'mealy' else moore_to_mealy(machine)
+    other = 'moore' if model == 'mealy' else 'mealy'
+    same, counterexample = check_conversion(machine, model, converted, other)
+    if not same:
+        raise ValueError(f"Converted machine differs on input '{counterexample}'")
+    return converted
+
+def conversion_question(detector, model='mealy'):
+    """Question asking how many states the smallest equivalent machine of the other model has."""
+    other = 'moore' if model == 'mealy' else 'mealy'
+    correct = minimize(convert(detector, model), other).num_states
+    correct_answer = str(correct)
+
+    possible_answers = [str(count) for count in range(max(1, correct - 2), correct + 2)][:4]
+    while len(possible_answers) < 4:
+        possible_answers.append(str(int(possible_answers[-1]) + 1))
+    random.shuffle(possible_answers)
+
+    if len(detector.patterns) == 1:
+        detects = f"the sequence '{detector.patterns[0]}'"
+    else:
+        detects = "the sequences " + ", ".join(f"'{pattern}'" for pattern in detector.patterns)
+    kind = 'overlapping' if detector.overlapping else 'non-overlapping'
+    question_text = (f"The {kind} {model.capitalize()} machine below detects {detects}. "
+                     f"How many states does the smallest equivalent {other.capitalize()} machine have?")
+    return question_text, possible_answers, correct_answer
@@ -0,0 +1,68 @@
+import random
+from collections import namedtuple
+
+# One missing transition: the answer and distractors are formatted like the generators' options
+Hole = namedtuple('Hole', ['state', 'symbol', 'answer', 'distractors'])
+
+def format_answer(detector, next_state, output=None):
+    """'S2 / 1' for a Mealy transition, 'S2' for a Moore one."""
+    name = detector.state_names[next_state]
+    return name if output is None else f"{name} / {output}"
+
+def _candidates(detector, state, symbol, model):
+    """Near-miss answers first (the usual mistakes), then every other possible answer."""
+    k = len(detector.alphabet)
+    row = state * k
+    next_state = detector.transitions[row + symbol]
+    near = [0, min(state + 1, detector.num_states - 1), detector.num_states - 1, state]
+    near += [detector.transitions[row + other] for other in range(k) if other != symbol]
+    if model == 'mealy':
+        output = detector.mealy_outputs[row + symbol]
+        outputs = sorted(set(detector.mealy_outputs))
+        if len(outputs) < 2:
+            outputs = [0, 1]
+        near_answers = [format_answer(detector, next_state, other) for other in outputs if other != output]
+        near_answers += [format_answer(detector, s, o) for s in near for o in outputs]
+        every_answer = [format_answer(detector, s, o) for s in range(detector.num_states) for o in outputs]
+    else:
+        near_answers = [format_answer(detector, s) for s in near]
+        every_answer = [format_answer(detector, s) for s in range(detector.num_states)]
+    return near_answers, every_answer
+
+def transition_holes(detector, model='mealy', num_distractors=3, skip_final=True):
+    """Yield a Hole for every (state, symbol) transition of a detector, without changing it.
+
+    Distractors are drawn at random from near misses (right state with the
+    wrong output, S0, the next or final state, the state itself, or where
+    the other symbol goes) and topped up from the remaining answers, so
+    they are always distinct and never equal to the answer. With skip_final
+    the final state of a sequence detector is left out, as the generators
+    always did.
+    """
+    if model not in ('mealy', 'moore'):
+        raise ValueError(f"Unknown model '{model}', expected 'mealy' or 'moore'")
+    k = len(detector.alphabet)
+    num_states = detector.num_states - 1 if skip_final else detector.num_states
+    for state in range(num_states):
+        for symbol in range(k):
+            next_state = detector.transitions[state * k + symbol]
+            output = detector.mealy_outputs[state * k + symbol] if model == 'mealy' else None
+            answer = format_answer(detector, next_state, output)
+            near, every = _candidates(detector, state, symbol, model)
+            near = list(dict.fromkeys(a for a in near if a != answer))
+            distractors = random.sample(near, min(num_distractors, len(near)))
+            rest = [a for a in dict.fromkeys(every) if a != answer and a not in distractors]
+            distractors += random.sample(rest, min(num_distractors - len(distractors), len(rest)))
+            yield Hole(detector.state_names[state], detector.alphabet[symbol], answer, distractors)
+
+def question_bank(detector, model='mealy', sequence=None):
+    """Every missing-transition question for one built detector, as (question_text, possible_answers, correct_answer)."""
+    sequence = sequence or getattr(detector, 'sequence', None)
+    questions = []
+    for hole in transition_holes(detector, model):
+        possible_answers = [hole.answer] + hole.distractors
+        random.shuffle(possible_answers)
+        question_text = (f"In the state diagram below, complete the missing transition for the sequence "
+                         f"'{sequence}' (Assume start is S0): {hole.state} --({hole.symbol})--> ?")
+        questions.append((question_text, possible_answers, hole.answer))
+    return questions
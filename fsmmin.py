@@ -0,0 +1,185 @@
+from array import array
+from collections import deque
+
+from automaton import Detector
+
+MODELS = ('mealy', 'moore')
+
+class TableMachine(Detector):
+    """A Mealy or Moore machine held in the same flat arrays as a detector.
+
+    transitions is indexed by state * len(alphabet) + symbol index and
+    outputs by the same index (Mealy) or by state (Moore). State 0 is the
+    start state.
+    """
+
+    def __init__(self, transitions, outputs, model='mealy', alphabet='01', state_names=None):
+        if model not in MODELS:
+            raise ValueError(f"Unknown model '{model}', expected 'mealy' or 'moore'")
+        self.model = model
+        self.alphabet = alphabet
+        self.symbol_index = {symbol: i for i, symbol in enumerate(alphabet)}
+        self.transitions = array('i', transitions)
+        self.num_states = len(self.transitions) // len(alphabet)
+        self.state_names = list(state_names) if state_names else [f'S{i}' for i in range(self.num_states)]
+        if model == 'mealy':
+            self.mealy_outputs = array('i', outputs)
+        else:
+            self.moore_outputs = array('i', outputs)
+
+def machine_outputs(machine, model):
+    return machine.mealy_outputs if model == 'mealy' else machine.moore_outputs
+
+def from_mealy_dict(transitions, start='S0', alphabet='01'):
+    """TableMachine from {state: {symbol: (next_state, output)}}, as the Mealy generators build."""
+    names = [start] + [name for name in transitions if name != start]
+    index = {name: i for i, name in enumerate(names)}
+    table, outputs = [], []
+    for name in names:
+        for symbol in alphabet:
+            next_state, output = transitions[name][symbol]
+            table.append(index[next_state])
+            outputs.append(int(output))
+    return TableMachine(table, outputs, 'mealy', alphabet, names)
+
+def from_moore_dict(transitions, outputs, start='S0', alphabet='01'):
+    """TableMachine from {state: {symbol: next_state}} and {state: output}, as the Moore generators build."""
+    names = [start] + [name for name in transitions if name != start]
+    index = {name: i for i, name in enumerate(names)}
+    table = [index[transitions[name][symbol]] for name in names for symbol in alphabet]
+    return TableMachine(table, [int(outputs[name]) for name in names], 'moore', alphabet, names)
+
+def _reachable_states(transitions, k):
+    order = [0]
+    seen = {0}
+    for state in order:
+        for next_state in transitions[state * k:(state + 1) * k]:
+            if next_state not in seen:
+                seen.add(next_state)
+                order.append(next_state)
+    return order
+
+def _partition(machine, model):
+    """Hopcroft refinement of the reachable states; returns (states, block of each state)."""
+    k = len(machine.alphabet)
+    transitions = machine.transitions
+    outputs = machine_outputs(machine, model)
+    states = _reachable_states(transitions, k)
+
+    # Initial blocks: states with the same output (Moore) or output row (Mealy)
+    by_output = {}
+    for state in states:
+        key = outputs[state] if model == 'moore' else tuple(outputs[state * k:(state + 1) * k])
+        by_output.setdefault(key, []).append(state)
+    blocks = [set(members) for members in by_output.values()]
+    block_of = {state: b for b, members in enumerate(blocks) for state in members}
+
+    # predecessors[symbol][state] lists the states that move to state on symbol
+    predecessors = [{state: [] for state in states} for _ in range(k)]
+    for state in states:
+        for symbol in range(k):
+            predecessors[symbol][transitions[state * k + symbol]].append(state)
+
+    largest = max(range(len(blocks)), key=lambda b: len(blocks[b]))
+    pending = {(b, symbol) for b in range(len(blocks)) if b != largest for symbol in range(k)}
+    while pending:
+        splitter, symbol = pending.pop()
+        touched = {}
+        for target in list(blocks[splitter]):
+            for state in predecessors[symbol][target]:
+                touched.setdefault(block_of[state], []).append(state)
+        for b, members in touched.items():
+            if len(members) == len(blocks[b]):
+                continue
+            # Move the touched states into a new block
+            new = len(blocks)
+            blocks.append(set(members))
+            blocks[b].difference_update(members)
+            for state in members:
+                block_of[state] = new
+            smaller = new if len(blocks[new]) <= len(blocks[b]) else b
+            for d in range(k):
+                pending.add((new, d) if (b, d) in pending else (smaller, d))
+    return states, block_of
+
+def minimize(machine, model='mealy'):
+    """Smallest machine with the same input/output behaviour, using Hopcroft's O(n log n) algorithm.
+
+    Unreachable states are dropped and the blocks are numbered breadth
+    first from the start state, so equivalent machines minimise to
+    identical tables. The result's state_map maps each original state to
+    its new state, or -1 if it was unreachable.
+    """
+    k = len(machine.alphabet)
+    states, block_of = _partition(machine, model)
+    number = {block_of[0]: 0}
+    representatives = [0]
+    for state in representatives:
+        for next_state in machine.transitions[state * k:(state + 1) * k]:
+            if block_of[next_state] not in number:
+                number[block_of[next_state]] = len(representatives)
+                representatives.append(next_state)
+
+    transitions = [number[block_of[next_state]]
+                   for state in representatives for next_state in machine.transitions[state * k:(state + 1) * k]]
+    outputs = machine_outputs(machine, model)
+    if model == 'mealy':
+        new_outputs = [output for state in representatives for output in outputs[state * k:(state + 1) * k]]
+    else:
+        new_outputs = [outputs[state] for state in representatives]
+    minimal = TableMachine(transitions, new_outputs, model, machine.alphabet)
+    minimal.state_map = array('i', [-1]) * machine.num_states
+    for state in states:
+        minimal.state_map[state] = number[block_of[state]]
+    return minimal
+
+def is_minimal(machine, model='mealy'):
+    return minimize(machine, model).num_states == machine.num_states
+
+def canonical_key(machine, model='mealy'):
+    """Hashable key that two machines share exactly when they are equivalent."""
+    minimal = minimize(machine, model)
+    return (machine.alphabet, minimal.transitions.tobytes(), machine_outputs(minimal, model).tobytes())
+
+def check_machine_equivalence(machine1, machine2, model='mealy'):
+    """Walk the product automaton breadth first from the pair of start states.
+
+    Returns (equivalent, counterexample) where counterexample is the
+    shortest input on which the outputs differ, or None.
+    """
+    if machine1.alphabet != machine2.alphabet:
+        raise ValueError("Machines over different alphabets cannot be compared")
+    alphabet = machine1.alphabet
+    k = len(alphabet)
+    outputs1, outputs2 = machine_outputs(machine1, model), machine_outputs(machine2, model)
+    if model == 'moore' and outputs1[0] != outputs2[0]:
+        return False, ''
+
+    seen = {(0, 0): None}
+    queue = deque([(0, 0)])
+    while queue:
+        pair = queue.popleft()
+        state1, state2 = pair
+        for symbol in range(k):
+            next1 = machine1.transitions[state1 * k + symbol]
+            next2 = machine2.transitions[state2 * k + symbol]
+            if model == 'mealy':
+                differs = outputs1[state1 * k + symbol] != outputs2[state2 * k + symbol]
+            else:
+                differs = outputs1[next1] != outputs2[next2]
+            if differs:
+                # Rebuild the input that led here
+                path = [alphabet[symbol]]
+                while seen[pair] is not None:
+                    pair, previous_symbol = seen[pair]
+                    path.append(alphabet[previous_symbol])
+                return False, ''.join(reversed(path))
+            if (next1, next2) not in seen:
+                seen[(next1, next2)] = (pair, symbol)
+                queue.append((next1, next2))
+    return True, None
+
+def grade_submissions(key_machine, submissions, model='mealy'):
+    """For each submitted machine, whether it behaves like the key; the key is minimised once."""
+    key = canonical_key(key_machine, model)
+    return [canonical_key(submission, model) == key for submission in submissions]
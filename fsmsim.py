@@ -0,0 +1,170 @@
+import random
+
+import numpy as np
+
+from automaton import SequenceDetector, build_detector
+
+# Streams at least this long are split into chunks that are simulated side by side
+CHUNK_THRESHOLD = 4096
+
+def transition_table(detector):
+    """The detector's transitions as a num_states x len(alphabet) array."""
+    return np.frombuffer(detector.transitions, dtype=np.int32).reshape(detector.num_states, len(detector.alphabet))
+
+def encode_streams(detector, streams):
+    """Turn one input string (or a list of equal-length strings) into a 2-D array of symbol codes."""
+    if isinstance(streams, str):
+        streams = [streams]
+    lookup = np.full(256, -1, dtype=np.int32)
+    for symbol, code in detector.symbol_index.items():
+        lookup[ord(symbol)] = code
+    codes = lookup[np.frombuffer(''.join(streams).encode('latin-1'), dtype=np.uint8)]
+    if (codes < 0).any():
+        raise ValueError(f"Input contains symbols outside the alphabet '{detector.alphabet}'")
+    return codes.reshape(len(streams), -1)
+
+def _run_lanes(table, codes, start_states):
+    """Advance every lane one symbol at a time; returns the state after each symbol."""
+    lanes, length = codes.shape
+    columns = np.ascontiguousarray(codes.T)
+    trace = np.empty((lanes, length), dtype=np.int32)
+    state = start_states
+    for t in range(length):
+        state = table[state, columns[t]]
+        trace[:, t] = state
+    return trace
+
+def _chunk_end_states(table, chunks):
+    """State at the end of every chunk (num_chunks x chunk_length) from every start state, without a trace."""
+    num_states = table.shape[0]
+    columns = np.ascontiguousarray(chunks.T)
+    state = np.repeat(np.arange(num_states, dtype=np.int32)[:, None], chunks.shape[0], axis=1)
+    for t in range(chunks.shape[1]):
+        state = table[state, columns[t]]
+    return state
+
+def run_states(detector, codes, start=0):
+    """State trace for a batch of encoded streams (streams x length), one column per input symbol.
+
+    Streams are advanced together with one NumPy gather per time step. A
+    single long stream is cut into chunks: a first pass finds where each
+    chunk ends from every possible start state, which fixes the true start
+    of every chunk, and a second pass traces all chunks side by side. The
+    Python loop runs over the chunk length rather than the stream length,
+    and only the end states (num_states x num_chunks) are kept besides the
+    trace itself.
+    """
+    table = transition_table(detector)
+    num_streams, length = codes.shape
+    if num_streams > 1 or length < CHUNK_THRESHOLD:
+        return _run_lanes(table, codes, np.full(num_streams, start, dtype=np.int32))
+
+    num_chunks = int(np.sqrt(length / detector.num_states)) or 1
+    chunk_length = -(-length // num_chunks)
+    padded = np.zeros(num_chunks * chunk_length, dtype=np.int32)
+    padded[:length] = codes[0]
+    chunks = padded.reshape(num_chunks, chunk_length)
+    end_states = _chunk_end_states(table, chunks)
+
+    starts = np.empty(num_chunks, dtype=np.int32)
+    state = start
+    for chunk in range(num_chunks):
+        starts[chunk] = state
+        state = end_states[state, chunk]
+    return _run_lanes(table, chunks, starts).reshape(1, -1)[:, :length]
+
+def simulate(detector, streams, model='mealy', start=0):
+    """Run a detector over input streams.
+
+    Returns (states, outputs), each a streams x length array: the state
+    after every symbol and the Mealy or Moore output at that step.
+    """
+    codes = encode_streams(detector, streams)
+    states = run_states(detector, codes, start)
+    if model == 'moore':
+        outputs = np.frombuffer(detector.moore_outputs, dtype=detector.moore_outputs.typecode)[states]
+    elif model == 'mealy':
+        previous = np.empty_like(states)
+        previous[:, 0] = start
+        previous[:, 1:] = states[:, :-1]
+        mealy = np.frombuffer(detector.mealy_outputs, dtype=detector.mealy_outputs.typecode).reshape(detector.num_states, -1)
+        outputs = mealy[previous, codes]
+    else:
+        raise ValueError(f"Unknown model '{model}', expected 'mealy' or 'moore'")
+    return states, outputs
+
+def brute_force_detections(stream, sequence, overlapping=True):
+    """Positions of the last symbol of every match, found by plain substring search."""
+    positions = []
+    i = stream.find(sequence)
+    while i >= 0:
+        positions.append(i + len(sequence) - 1)
+        i = stream.find(sequence, i + (1 if overlapping else len(sequence)))
+    return positions
+
+def brute_force_outputs(stream, patterns, output_codes, overlapping=True):
+    """Output code after every symbol: that of the longest pattern ending there, 0 if none.
+
+    In non-overlapping mode a match may not start before the end of the
+    previous one.
+    """
+    by_length = sorted(zip(patterns, output_codes), key=lambda item: -len(item[0]))
+    outputs = []
+    window_start = 0
+    for end in range(1, len(stream) + 1):
+        code = next((code for pattern, code in by_length
+                     if end - len(pattern) >= window_start and stream.startswith(pattern, end - len(pattern))), 0)
+        outputs.append(code)
+        if code and not overlapping:
+            window_start = end
+    return outputs
+
+def self_check(detector, stream, model='mealy'):
+    """True if the detector's outputs match a brute-force substring matcher on the stream."""
+    _, outputs = simulate(detector, stream, model)
+    if isinstance(detector, SequenceDetector):
+        expected = brute_force_detections(stream, detector.sequence, detector.overlapping)
+        return np.flatnonzero(outputs[0]).tolist() == expected
+    return outputs[0].tolist() == brute_force_outputs(stream, detector.patterns, detector.output_codes,
+                                                      detector.overlapping)
+
+def random_stream(length, alphabet='01'):
+    return ''.join(random.choice(alphabet) for _ in range(length))
+
+def output_sequence_question(sequence, overlapping=True, model='mealy', length=12):
+    """Question asking for the output stream produced by an input stream."""
+    detector = build_detector(sequence, overlapping)
+    stream = random_stream(length)
+    _, outputs = simulate(detector, stream, model)
+    correct_answer = ''.join(map(str, outputs[0]))
+
+    # Wrong answers flip one or two output bits
+    possible_answers = {correct_answer}
+    while len(possible_answers) < 4:
+        flipped = list(correct_answer)
+        for position in random.sample(range(length), random.randint(1, 2)):
+            flipped[position] = '1' if flipped[position] == '0' else '0'
+        possible_answers.add(''.join(flipped))
+    possible_answers = list(possible_answers)
+    random.shuffle(possible_answers)
+
+    kind = 'An overlapping' if overlapping else 'A non-overlapping'
+    question_text = (f"{kind} {model.capitalize()} machine detects the sequence '{sequence}' (start is S0). "
+                     f"What is its output for the input {stream}?")
+    return question_text, possible_answers, correct_answer
+
+def detection_count_question(sequence, overlapping=True, length=16):
+    """Question asking how many times the sequence is detected in an input stream."""
+    detector = build_detector(sequence, overlapping)
+    stream = random_stream(length)
+    _, outputs = simulate(detector, stream)
+    correct_answer = str(int(outputs.sum()))
+
+    possible_answers = [str(count) for count in range(max(0, int(correct_answer) - 2), int(correct_answer) + 2)][:4]
+    while len(possible_answers) < 4:
+        possible_answers.append(str(int(possible_answers[-1]) + 1))
+    random.shuffle(possible_answers)
+
+    kind = 'overlapping' if overlapping else 'non-overlapping'
+    question_text = f"How many times does a {kind} detector for '{sequence}' fire on the input {stream}?"
+    return question_text, possible_answers, correct_answer
@@ -0,0 +1,107 @@
+import re
+from array import array
+
+from graphviz import Digraph
+
+from gvrender import render_svg, render_svgs
+from chainlayout import chain_svg
+from rendercache import default_cache, content_key
+from artifactstore import open_store
+
+# 'graphviz' runs dot; 'python' uses the in-process chain layout of chainlayout.py
+DIAGRAM_BACKEND = 'graphviz'
+BACKENDS = ('graphviz', 'python')
+
+def edge_id(state, symbol):
+    return f"edge_{state}_{symbol}"
+
+def machine_graph(detector, model='mealy'):
+    """Digraph of the complete machine; every edge carries the id edge_<state>_<symbol>."""
+    dot = Digraph()
+    k = len(detector.alphabet)
+    for state, name in enumerate(detector.state_names):
+        label = f"{name}/{detector.moore_outputs[state]}" if model == 'moore' else name
+        dot.node(name, label=label, id=f"node_{name}")
+    for state, name in enumerate(detector.state_names):
+        for i, symbol in enumerate(detector.alphabet):
+            next_state = detector.state_names[detector.transitions[state * k + i]]
+            label = f"{symbol}/{detector.mealy_outputs[state * k + i]}" if model == 'mealy' else symbol
+            dot.edge(name, next_state, label=label, id=edge_id(name, symbol))
+    return dot
+
+def layout_svg(source):
+    """Run dot once for a DOT source; machines with the same source share the SVG through the render cache."""
+    return default_cache().get_or_render('dot', (source,), lambda: render_svg(source).decode('utf-8'))
+
+def machine_key(detector, model='mealy'):
+    """Everything a diagram is drawn from: alphabet, state names, transitions and the model's outputs."""
+    outputs = detector.mealy_outputs if model == 'mealy' else detector.moore_outputs
+    return (model, detector.alphabet, tuple(detector.state_names),
+            array('i', detector.transitions).tobytes(), array('i', outputs).tobytes())
+
+def _backend(backend):
+    backend = backend or DIAGRAM_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown diagram backend '{backend}', expected one of {BACKENDS}")
+    return backend
+
+def machine_svg(detector, model='mealy', backend=None):
+    backend = _backend(backend)
+    if backend == 'python':
+        return default_cache().get_or_render('chain', machine_key(detector, model), lambda: chain_svg(detector, model))
+    return layout_svg(machine_graph(detector, model).source)
+
+def machine_svgs(detectors, model='mealy', backend=None):
+    """SVGs for many machines at once; those not cached are laid out in batches by the shared dot worker pool."""
+    if _backend(backend) == 'python':
+        return [machine_svg(detector, model, 'python') for detector in detectors]
+    cache = default_cache()
+    sources = [machine_graph(detector, model).source for detector in detectors]
+    keys = [content_key('dot', (source,)) for source in sources]
+    svgs = [cache.get(key) for key in keys]
+    missing = [i for i, svg in enumerate(svgs) if svg is None]
+    for i, svg in zip(missing, render_svgs([sources[i] for i in missing])):
+        svgs[i] = cache.put(keys[i], svg.decode('utf-8'))
+    return svgs
+
+def _edge_pattern(state, symbol):
+    # The edge's <g> group and the comment dot writes just before it
+    return re.compile(r'(?:<!--(?:(?!-->).)*-->\s*)?<g id="%s" class="edge">.*?</g>\n?' % re.escape(edge_id(state, symbol)),
+                      re.DOTALL)
+
+def _grey(group):
+    group = group.replace('stroke="black"', 'stroke="lightgrey" stroke-dasharray="5,2"')
+    group = group.replace('fill="black"', 'fill="lightgrey"')
+    return group.replace('<text ', '<text fill="lightgrey" ')
+
+def hole_variant(svg, state, symbol, style='drop'):
+    """The SVG with one transition dropped (for questions) or greyed out (for answer keys).
+
+    Works on the SVG text of the complete machine, so no new layout is
+    needed; variants are kept in the render cache by diagram and edge.
+    """
+    return default_cache().get_or_render('hole', (svg, state, symbol, style),
+                                         lambda: _cut_edge(svg, state, symbol, style))
+
+def _cut_edge(svg, state, symbol, style):
+    pattern = _edge_pattern(state, symbol)
+    if not pattern.search(svg):
+        raise ValueError(f"No edge {state} --({symbol})--> in the diagram")
+    if style == 'drop':
+        return pattern.sub('', svg, count=1)
+    if style == 'grey':
+        return pattern.sub(lambda match: _grey(match.group(0)), svg, count=1)
+    raise ValueError(f"Unknown style '{style}', expected 'drop' or 'grey'")
+
+def hole_variants(detector, holes, model='mealy', style='drop', backend=None):
+    """(hole, svg) for each hole, all cut from a single layout of the machine."""
+    svg = machine_svg(detector, model, backend)
+    return [(hole, hole_variant(svg, hole.state, hole.symbol, style)) for hole in holes]
+
+def save_svg(svg, image_dir, filename):
+    """Keep an SVG in the artifact store of image_dir, labelled filename in its manifest, and return its path.
+
+    Files are named by content, so workers drawing the same diagram share
+    one file and different diagrams never overwrite each other.
+    """
+    return open_store(image_dir).put(svg, '.svg', label=filename)
@@ -0,0 +1,82 @@
+import os
+import re
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from graphviz import ExecutableNotFound, CalledProcessError
+
+DOT_BINARY = "dot"
+
+# Graphs sent to one dot process, and dot processes allowed to run at once
+BATCH_SIZE = 32
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Every SVG document dot writes starts with its own XML declaration
+_DOCUMENT_START = re.compile(rb'(?=<\?xml )')
+
+def render_batch(sources, output_format="svg"):
+    """Render DOT sources with a single dot process, in memory; returns one bytes document per source.
+
+    dot accepts several graphs on standard input and writes their outputs
+    one after another, so no DOT or SVG file ever touches the disk.
+    """
+    cmd = [DOT_BINARY, f"-T{output_format}"]
+    try:
+        proc = subprocess.run(cmd, input="\n".join(sources).encode('utf-8'), capture_output=True)
+    except FileNotFoundError as e:
+        raise ExecutableNotFound(cmd) from e
+    if proc.returncode:
+        raise CalledProcessError(proc.returncode, cmd, output=proc.stdout, stderr=proc.stderr)
+    documents = [document for document in _DOCUMENT_START.split(proc.stdout) if document]
+    if len(documents) != len(sources):
+        raise ValueError(f"dot returned {len(documents)} documents for {len(sources)} graphs")
+    return documents
+
+class GraphvizRenderer:
+    """Renders DOT sources to SVG bytes through a bounded pool of dot workers.
+
+    Sources are deduplicated and split into batches of batch_size; at most
+    max_workers dot processes run at the same time.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dot")
+
+    def render_many(self, sources):
+        unique = list(dict.fromkeys(sources))
+        batches = [unique[i:i + self.batch_size] for i in range(0, len(unique), self.batch_size)]
+        rendered = {}
+        for batch, documents in zip(batches, self.executor.map(render_batch, batches)):
+            rendered.update(zip(batch, documents))
+        return [rendered[source] for source in sources]
+
+    def render(self, source):
+        return self.executor.submit(render_batch, [source]).result()[0]
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_default_renderer = None
+_default_lock = threading.Lock()
+
+def default_renderer():
+    """The renderer shared by every diagram module, created on first use."""
+    global _default_renderer
+    with _default_lock:
+        if _default_renderer is None:
+            _default_renderer = GraphvizRenderer()
+        return _default_renderer
+
+def render_svg(source):
+    return default_renderer().render(source)
+
+def render_svgs(sources):
+    return default_renderer().render_many(sources)
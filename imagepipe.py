@@ -0,0 +1,114 @@
+import os
+import re
+from io import BytesIO
+
+from rendercache import default_cache
+from artifactstore import open_store
+from pdftable import truth_table_headers, table_cells
+
+# How diagrams are put into the PDFs: 'vector' draws the SVG itself as PDF paths
+# (fpdf2 parses it), 'raster' embeds a PNG made by cairosvg
+IMAGE_MODES = ('vector', 'raster')
+IMAGE_MODE = 'vector'
+
+# Two quirks of schemdraw's SVG that fpdf2 cannot draw: solid lines are written as
+# "stroke-dasharray:-", which is not valid SVG (a dash array without numbers is just
+# a solid line), and text asks for the "sans" family, which fpdf2 does not map to a font
+_SOLID_DASHARRAY = re.compile(rb'stroke-dasharray:[^;"0-9]*;?')
+_SANS_FAMILY = re.compile(rb'font-family="sans"')
+# Graphviz gives every node and edge a <title>, which fpdf2 warns about and skips
+_TITLE = re.compile(rb'<title>.*?</title>', re.S)
+
+# Rasterising at twice the drawing size keeps the PDF images sharp
+PNG_SCALE = 2.0
+
+def drawing_svg(drawing):
+    """SVG bytes of a schemdraw drawing, without saving it."""
+    return drawing.get_imagedata('svg')
+
+def svg_bytes(svg):
+    """SVG text or bytes as bytes, starting at the XML declaration or <svg> tag fpdf2 looks for."""
+    if isinstance(svg, str):
+        svg = svg.encode('utf-8')
+    return svg.lstrip()
+
+def vector_svg(svg):
+    """SVG bytes cleaned of what fpdf2 cannot draw or warns about."""
+    svg = _TITLE.sub(b'', _SOLID_DASHARRAY.sub(b'', svg_bytes(svg)))
+    return _SANS_FAMILY.sub(b'font-family="sans-serif"', svg)
+
+def _rasterise(svg, scale):
+    # Imported here so vector jobs do not need cairo installed
+    import cairosvg
+    return cairosvg.svg2png(bytestring=svg, scale=scale)
+
+def svg_to_png(svg, scale=PNG_SCALE):
+    """Rasterise SVG text or bytes into an in-memory PNG that FPDF.image accepts.
+
+    The same SVG at the same scale is only rasterised once, through the shared render cache.
+    """
+    svg = svg_bytes(svg)
+    return BytesIO(default_cache().get_or_render('png', (svg, scale), lambda: _rasterise(svg, scale)))
+
+def keep_image(data, path):
+    """Keep an image in the artifact store of path's directory and return where it was stored.
+
+    The file is named by its content and the manifest records the name
+    from path as its label, so parallel jobs and repeated runs never
+    overwrite each other. Only used when files are explicitly asked for.
+    """
+    if isinstance(data, BytesIO):
+        data = data.getvalue()
+    directory, name = os.path.split(path)
+    label, ext = os.path.splitext(name)
+    return open_store(directory or '.').put(data, ext, label=label)
+
+def _draw_table(table_str, colfmt):
+    # Imported here so the FSM generators do not load schemdraw
+    import schemdraw
+    from schemdraw.logic import table
+    d = schemdraw.Drawing()
+    d += table.Table(table=table_str.strip(), colfmt=colfmt)
+    return drawing_svg(d)
+
+def truth_table_svg(truth_table, num_vars, save_path=None):
+    """SVG bytes of (values, Q) rows drawn as a table by schemdraw; Q may be a placeholder such as '?'.
+
+    The table text is the render cache key, so the same table is drawn
+    once. With save_path the SVG is also kept through keep_image.
+    """
+    headers = truth_table_headers(num_vars)
+    table_str = " | ".join(headers) + "\n" + "|".join(["---"] * len(headers)) + "\n"
+    table_str += "".join(" | ".join(row) + "\n" for row in table_cells(truth_table))
+    colfmt = 'c|' * len(headers)
+    svg = default_cache().get_or_render('truth_table', (table_str, colfmt), lambda: _draw_table(table_str, colfmt))
+    if save_path:
+        save_path = keep_image(svg, save_path)
+        print(f"Truth table saved as {save_path}")
+    return svg
+
+def image_mode(mode=None):
+    """The mode a job asked for, or IMAGE_MODE when it did not ask."""
+    mode = mode or IMAGE_MODE
+    if mode not in IMAGE_MODES:
+        raise ValueError(f"Unknown image mode '{mode}', expected one of {IMAGE_MODES}")
+    return mode
+
+def add_svg(pdf, svg, keep_as=None, mode=None, **placement):
+    """Place an SVG on the current PDF page, entirely in memory.
+
+    In vector mode the SVG is drawn as PDF paths; in raster mode it is
+    embedded as a PNG. placement is passed to FPDF.image (x, y, w, h).
+    With keep_as (a path without extension) the SVG, and the PNG in raster
+    mode, are also kept in the artifact store of that directory.
+    """
+    svg = svg_bytes(svg)
+    if keep_as:
+        keep_image(svg, f"{keep_as}.svg")
+    if image_mode(mode) == 'vector':
+        pdf.image(BytesIO(vector_svg(svg)), **placement)
+        return
+    png = svg_to_png(svg)
+    if keep_as:
+        keep_image(png, f"{keep_as}.png")
+    pdf.image(png, **placement)
@@ -1,12 +1,16 @@
-import itertools
 import random
 import os
-import schemdraw
-from schemdraw.logic import table
 from fpdf import FPDF
 import time
-from cairosvg import svg2png
-from io import BytesIO
+from bitparallel import truth_table_signature, signature_rows
+from expressionset import ExpressionSet
+from sampler import PlainChainSpace, ExpressionSpaceExhausted, check_capacity, draw_new_expression
+from distractors import nearby_bit_patterns
+from imagepipe import truth_table_svg
+from pdftable import truth_table_headers, table_cells, table_width, draw_truth_table
+
+# Preferred number of missing entries on which a wrong option differs from the answer
+OPTION_DISTANCE = 1
 
 # Directories to save truth table PDFs and images
 pdf_directory = r'C:\Users\Lenovo\OneDrive\Desktop\logicgates\pdf'
@@ -16,87 +20,46 @@ image_directory = r'C:\Users\Lenovo\OneDrive\Desktop\logicgates\Truthtable'
 os.makedirs(pdf_directory, exist_ok=True)
 os.makedirs(image_directory, exist_ok=True)
 
-# Possible operators for generating random expressions
-operators = ['and', 'or', 'not']
-
 # Function to generate a random logical expression
 def generate_random_expression(num_vars):
     variables = [chr(65 + i) for i in range(num_vars)]  # A, B, C, D, E...
-    expr = variables[0]
-    for i in range(1, num_vars):
-        op = random.choice(operators[:-1])  # Choose 'and' or 'or'
-        if random.choice([True, False]):
-            expr = f'{expr} {op} {variables[i]}'
-        else:
-            expr = f'{expr} {op} not {variables[i]}'
-    if random.choice([True, False]):
-        expr = f'not ({expr})'
-    return expr
-
-# Function to evaluate logical expressions
-def evaluate_expression(expr, values_dict):
-    for var in values_dict:
-        expr = expr.replace(var, str(values_dict[var]))
-    return eval(expr)
+    return PlainChainSpace(variables).random()
 
 # Function to generate the truth table with 50% missing entries
-def generate_truth_table_image(expr, save_path, num_vars, complete=False):
-    headers = [chr(65 + i) for i in range(num_vars)]  # A, B, C, D, E...
-    headers.append('Q')
-    
-    table_str = " | ".join(headers) + "\n"
-    table_str += "|".join(["---"] * (num_vars + 1)) + "\n"
-    
-    all_rows = []
-    missing_values = []
-
-    for values in itertools.product([0, 1], repeat=num_vars):
-        values_dict = {chr(65 + i): val for i, val in enumerate(values)}
-        Q = int(evaluate_expression(expr, values_dict))
-        all_rows.append((values_dict, Q))
+# Returns the (values, Q) rows, with Q as '?' where the entry is missing, and the missing values
+def generate_truth_table(expr, num_vars, complete=False):
+    all_rows = [(values, int(Q)) for values, Q in signature_rows(truth_table_signature(expr, num_vars), num_vars)]
     
     num_rows = len(all_rows)
     missing_indices = set(random.sample(range(num_rows), num_rows // 2))  # 50% missing entries
     
-    for i, (values_dict, Q) in enumerate(all_rows):
+    truth_table = []
+    missing_values = []
+    for i, (values, Q) in enumerate(all_rows):
         if complete or i not in missing_indices:  # Include the correct answer if complete
-            table_str += " | ".join(str(values_dict[header]) for header in headers[:-1]) + f" | {Q}\n"
+            truth_table.append((values, Q))
         else:
-            table_str += " | ".join(str(values_dict[header]) for header in headers[:-1]) + " | ?\n"  # Leave missing entries
+            truth_table.append((values, '?'))  # Leave missing entries
             missing_values.append(Q)
-    
-    # Generate the truth table image using schemdraw and save as SVG
-    colfmt = 'c|' * (num_vars + 1)
-    tbl_schem = table.Table(table=table_str.strip(), colfmt=colfmt)
-    d = schemdraw.Drawing()
-    d += tbl_schem
-    d.save(save_path)
-    print(f"Truth table saved as {save_path}")
-
-    return missing_values  # Return missing values for generating options
-
-# Function to convert SVG to PNG in-memory and return a BytesIO object with adjusted size and quality
-def convert_svg_to_png(svg_content):
-    png_io = BytesIO()
-    svg2png(bytestring=svg_content, write_to=png_io, scale=2.0)  # Increased scale for better quality
-    png_io.seek(0)  # Reset the pointer to the beginning of the BytesIO object
-    return png_io
+
+    return truth_table, missing_values  # Missing values are used for generating options
 
 # Function to generate the four options for the missing entries
 def generate_options(correct_missing_values):
     options = [correct_missing_values]
 
-    # Generate three incorrect options
-    while len(options) < 4:
-        incorrect_option = [random.choice([0, 1]) for _ in range(len(correct_missing_values))]
-        if incorrect_option != correct_missing_values and incorrect_option not in options:
-            options.append(incorrect_option)
+    # Generate three distinct incorrect options by flipping missing entries; when
+    # too few patterns are OPTION_DISTANCE flips away, further ones make up the
+    # rest, so a table with two or more missing entries always gets all three
+    options += nearby_bit_patterns(correct_missing_values, 3, OPTION_DISTANCE)
 
     random.shuffle(options)  # Shuffle options so the correct one isn't always first
     return options
 
 # Function to generate a PDF with questions, options, and answers
-def generate_pdf(questions, answers, options_list):
+# answers holds each question's truth table rows, drawn natively on the page;
+# keep_images also saves every table as an SVG drawn by schemdraw
+def generate_pdf(questions, answers, options_list, keep_images=False):
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)  # Adjust margin as needed
 
@@ -120,34 +83,28 @@ def generate_pdf(questions, answers, options_list):
             question_text = f"Question {i+1}: Fill in the missing entries for the expression: {questions[i][1]}"
             pdf.multi_cell(0, 10, txt=question_text, align='L')
 
-            # Save the current Y position to place the image
+            # Save the current Y position to place the table
             y_position = pdf.get_y()
 
             # Add the options for the missing entries
-            options_text = "Options:\n"
-            for j, option in enumerate(options_list[i]):
-                options_text += f"{j+1}: {' '.join(map(str, option))}\n"
-            pdf.multi_cell(0, 10, txt=options_text, align='L')
-
-            # Add the image corresponding to this question
-            with open(answers[i], 'rb') as svg_file:
-                svg_content = svg_file.read()
-                png_data = convert_svg_to_png(svg_content)
-                # Save the PNG temporarily
-                png_temp_path = f'tmp_image_{i+1}.png'
-                with open(png_temp_path, 'wb') as f:
-                    f.write(png_data.read())
-                
-                img_width = pdf.w / 3  # Adjust width to fit one-third of page width
-                img_height = img_width * 0.75 * 1.50 # Increase height by 25%
-
-
-                # Calculate x position to place the image 4 cm (40 mm) to the right of the question text
-                x_position = 50  # 40 mm = 4 cm from the left margin
-                pdf.image(png_temp_path, x=x_position, y=y_position, w=img_width, h=img_height)
-                os.remove(png_temp_path)  # Delete the temporary PNG file
-
-            pdf.ln(img_height + 2)  # Ensure space between questions and images
+            option_lines = [f"{j+1}: {' '.join(map(str, option))}" for j, option in enumerate(options_list[i])]
+            pdf.multi_cell(0, 10, txt="Options:\n" + "\n".join(option_lines) + "\n", align='L')
+            text_end, page = pdf.get_y(), pdf.page
+
+            # Place the table 4 cm (40 mm) from the left margin, or just right of longer options;
+            # when the options are too long for both to fit side by side it goes below them
+            num_vars = questions[i][0]
+            headers = truth_table_headers(num_vars)
+            x_position = max(50, pdf.l_margin + max(pdf.get_string_width(line) for line in option_lines) + 10)
+            if x_position + table_width(len(headers)) > pdf.w - pdf.r_margin:
+                x_position, y_position = 50, text_end
+            if keep_images:
+                truth_table_svg(answers[i], num_vars, os.path.join(image_directory, f"incomplete_truth_table_{i+1}.svg"))
+
+            # Draw the table; a long one continues on the next page and the next question follows it
+            table_end = draw_truth_table(pdf, headers, table_cells(answers[i]), x=x_position, y=y_position)
+            pdf.set_y(max(table_end, text_end) if pdf.page == page else table_end)
+            pdf.ln(2)  # Ensure space between questions and tables
         
         # Add a line break before the next set of questions
         pdf.ln(3)
@@ -199,29 +156,34 @@ def main():
     questions = []
     answers = []
     options_list = []
-    generated_expressions = set()
+    generated_expressions = ExpressionSet()
+
+    # Functions over 2 or 3 variables are drawn without replacement
+    samplers = {num_vars: PlainChainSpace([chr(65 + i) for i in range(num_vars)]).function_sampler(generated_expressions)
+                for num_vars in (2, 3)}
+    try:
+        check_capacity(samplers, num_questions)
+    except ExpressionSpaceExhausted as e:
+        print(e)
+        return
 
     while len(questions) < num_questions:
         print(f"Generating question {len(questions) + 1}/{num_questions}...")
 
-        num_vars = random.choice([2, 3])
-        expr = generate_random_expression(num_vars)
-
-        # Check for duplicates
-        if expr in generated_expressions:
-            print("Duplicate expression found. Generating a new one.")
-            continue
-
-        generated_expressions.add(expr)
-
-        incomplete_image_path = os.path.join(image_directory, f"incomplete_truth_table_{len(questions) + 1}.svg")
+        # Draw an expression for a function not asked about yet, skipping
+        # different expressions for the same function
+        try:
+            num_vars, expr = draw_new_expression(samplers, generated_expressions)
+        except ExpressionSpaceExhausted as e:
+            print(f"Only {len(questions)} unique questions could be generated: {e}")
+            return
 
-        correct_missing_values = generate_truth_table_image(expr, incomplete_image_path, num_vars, complete=False)
+        incomplete_table, correct_missing_values = generate_truth_table(expr, num_vars, complete=False)
 
         options = generate_options(correct_missing_values)
 
         questions.append((num_vars, expr, correct_missing_values))
-        answers.append(incomplete_image_path)
+        answers.append(incomplete_table)
         options_list.append(options)
 
     generate_pdf(questions, answers, options_list)
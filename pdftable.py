@@ -0,0 +1,64 @@
+# Size of a truth table drawn on a PDF page, in mm
+COLUMN_WIDTH = 10
+ROW_HEIGHT = 6
+FONT = "Arial"
+FONT_SIZE = 11
+
+def truth_table_headers(num_vars):
+    """Column names A, B, C, ... followed by the output column Q."""
+    return [chr(65 + i) for i in range(num_vars)] + ['Q']
+
+def table_cells(truth_table):
+    """Cell text of every (values, Q) row: the input bits, then Q as 0, 1 or a placeholder such as '?'."""
+    return [[str(value) for value in values] + [Q if isinstance(Q, str) else str(int(Q))]
+            for values, Q in truth_table]
+
+def table_width(num_columns, column_width=COLUMN_WIDTH):
+    return num_columns * column_width
+
+def draw_truth_table(pdf, headers, rows, x=None, y=None, column_width=COLUMN_WIDTH, row_height=ROW_HEIGHT):
+    """Draw a truth table straight onto the PDF with cells and lines; returns the y just below it.
+
+    Like the schemdraw tables, a rule runs under the header and right of
+    every column. A row that would cross the bottom margin moves the table
+    to a new page, where the header is repeated, so 5 and 6 variable
+    tables are split across pages instead of shrunk; the PDF is left on
+    the page where the table ends.
+    """
+    x = pdf.get_x() if x is None else x
+    y = pdf.get_y() if y is None else y
+    right = x + table_width(len(headers), column_width)
+
+    def draw_row(texts, top):
+        for i, text in enumerate(texts):
+            pdf.set_xy(x + i * column_width, top)
+            pdf.cell(column_width, row_height, text, align='C')
+
+    def draw_header(top):
+        pdf.set_font(FONT, 'B', FONT_SIZE)
+        draw_row(headers, top)
+        pdf.line(x, top + row_height, right, top + row_height)
+        pdf.set_font(FONT, '', FONT_SIZE)
+        return top + row_height
+
+    def draw_column_rules(top, bottom):
+        for i in range(1, len(headers) + 1):
+            pdf.line(x + i * column_width, top, x + i * column_width, bottom)
+
+    # The header never sits alone at the bottom of a page
+    if y + 2 * row_height > pdf.page_break_trigger:
+        pdf.add_page()
+        y = pdf.t_margin
+    top = y
+    y = draw_header(top)
+    for row in rows:
+        if y + row_height > pdf.page_break_trigger:
+            draw_column_rules(top, y)
+            pdf.add_page()
+            top = pdf.t_margin
+            y = draw_header(top)
+        draw_row(row, y)
+        y += row_height
+    draw_column_rules(top, y)
+    pdf.set_xy(pdf.l_margin, y)
+    return y
@@ -0,0 +1,122 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from artifactstore import open_store
+
+# Total size of the renders kept in memory; the least recently used are dropped beyond it
+MAX_BYTES = 64 * 1024 * 1024
+
+# Directory of an artifact store that keeps renders between runs and shares them
+# between workers; None keeps them in memory only
+PERSIST_DIR = None
+
+def content_key(kind, content):
+    """Hash of what fully determines a render: its kind and a tuple of canonical parts.
+
+    Parts may be text, bytes or anything with a stable repr (numbers,
+    tuples of them); each is tagged with its type and length-prefixed, so
+    1 and '1', or different splits of the same bytes, never collide.
+    """
+    digest = hashlib.sha256(kind.encode('utf-8'))
+    for part in content:
+        if isinstance(part, str):
+            tag, part = b's', part.encode('utf-8')
+        elif isinstance(part, (bytes, bytearray, memoryview)):
+            tag = b'b'
+        else:
+            tag, part = b'r', repr(part).encode('utf-8')
+        digest.update(tag + len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+class RenderCache:
+    """Rendered SVG and PNG data keyed by content hash, with LRU eviction by total size.
+
+    Safe to share between threads; a render is done outside the lock, so
+    two threads missing the same key at once may both render it. With a
+    store (an artifactstore.ArtifactStore) renders missing from memory are
+    looked up on disk, and new ones are written there for later runs.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, store=None):
+        self.max_bytes = max_bytes
+        self.store = store
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return data
+        data = self.store.load(key) if self.store else None
+        with self.lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        return self._remember(key, data)
+
+    def put(self, key, data, kind=None):
+        if self.store and self.store.find(key) is None:
+            self.store.put(data, label=kind, key=key)
+        return self._remember(key, data)
+
+    def _remember(self, key, data):
+        # Text is counted by characters, which is close enough for a size bound
+        if len(data) > self.max_bytes:
+            return data
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            self.entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+        return data
+
+    def get_or_render(self, kind, content, render):
+        """The cached render of the content, calling render() and storing its result on a miss."""
+        key = content_key(kind, content)
+        data = self.get(key)
+        if data is None:
+            data = self.put(key, render(), kind)
+        return data
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            hit_rate = (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses, 'hit_rate': hit_rate,
+                    'entries': len(self.entries), 'bytes': self.size, 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.hits = self.disk_hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def default_cache():
+    """The cache shared by every renderer, created on first use."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = RenderCache(store=open_store(PERSIST_DIR) if PERSIST_DIR else None)
+        return _default_cache
+
+def cached_render(kind, content, render):
+    return default_cache().get_or_render(kind, content, render)
@@ -0,0 +1,182 @@
+import random
+
+class ExpressionSpaceExhausted(ValueError):
+    """Raised when more unique expressions are requested than the space holds."""
+
+class ChainSpace:
+    """Expressions built like finaltruthtable.generate_random_expression.
+
+    A starting variable followed by min_ops to max_ops steps, each one
+    '(expression) op (operand)' with op in and/or and operand a variable or
+    'not (variable)'. Every expression has an index in [0, size) and unrank
+    rebuilds it from that index.
+    """
+
+    operators = ['and', 'or']
+
+    def __init__(self, variables, min_ops=1, max_ops=3):
+        self.variables = list(variables)
+        self.num_vars = len(self.variables)
+        self.step_choices = len(self.operators) * 2 * self.num_vars
+        self.bucket_sizes = [self.num_vars * self.step_choices ** k for k in range(min_ops, max_ops + 1)]
+        self.min_ops = min_ops
+        self.size = sum(self.bucket_sizes)
+        self._functions = {}
+
+    def unrank(self, index):
+        num_ops = self.min_ops
+        for bucket_size in self.bucket_sizes:
+            if index < bucket_size:
+                break
+            index -= bucket_size
+            num_ops += 1
+        index, first = divmod(index, self.num_vars)
+        expression = self.variables[first]
+        for _ in range(num_ops):
+            index, step = divmod(index, self.step_choices)
+            step, op = divmod(step, len(self.operators))
+            var, negate = divmod(step, 2)
+            expr = self.variables[var]
+            if negate:
+                expr = f'not ({expr})'
+            expression = f'({expression}) {self.operators[op]} ({expr})'
+        return expression
+
+    def random(self):
+        """One uniformly drawn expression, with replacement."""
+        return self.unrank(random.randrange(self.size))
+
+    def sampler(self):
+        return UniqueSampler(self)
+
+    def function_sampler(self, expression_set):
+        return FunctionSampler(self, expression_set)
+
+    def functions(self, expression_set):
+        """The distinct functions of the space as expression_set tells them apart.
+
+        Returns (keys, forms): the key of every function and the indices of
+        the expressions that compute it. The space is enumerated once per
+        deduplication mode and the result kept on the space.
+        """
+        mode = (expression_set.mode, expression_set.variables)
+        if mode not in self._functions:
+            forms = {}
+            for index in range(self.size):
+                forms.setdefault(expression_set.key(self.unrank(index), self.num_vars), []).append(index)
+            self._functions[mode] = (list(forms), list(forms.values()))
+        return self._functions[mode]
+
+class PlainChainSpace(ChainSpace):
+    """Expressions built like missing.generate_random_expression.
+
+    Every variable in order joined by and/or, each after the first
+    optionally negated with 'not', and the whole expression optionally
+    wrapped in 'not (...)'.
+    """
+
+    def __init__(self, variables):
+        self.variables = list(variables)
+        self.num_vars = len(self.variables)
+        self.size = 2 * (len(self.operators) * 2) ** (self.num_vars - 1)
+        self._functions = {}
+
+    def unrank(self, index):
+        index, negate_all = divmod(index, 2)
+        expr = self.variables[0]
+        for var in self.variables[1:]:
+            index, step = divmod(index, len(self.operators) * 2)
+            negate, op = divmod(step, len(self.operators))
+            expr = f'{expr} {self.operators[op]} {"not " if negate else ""}{var}'
+        if negate_all:
+            expr = f'not ({expr})'
+        return expr
+
+class UniqueSampler:
+    """Draw expressions from a space uniformly without replacement.
+
+    A lazy Fisher-Yates shuffle over the index range: each draw is O(1) and
+    only the swapped positions are stored.
+    """
+
+    def __init__(self, space):
+        self.space = space
+        self.remaining = space.size
+        self.swapped = {}
+
+    def __len__(self):
+        return self.remaining
+
+    def draw(self):
+        return self.space.unrank(self._draw_index())
+
+    def _draw_index(self):
+        if self.remaining == 0:
+            raise ExpressionSpaceExhausted(
+                f"All {self.space.size} expressions over {self.space.variables} have already been drawn")
+        position = random.randrange(self.remaining)
+        self.remaining -= 1
+        index = self.swapped.get(position, position)
+        self.swapped[position] = self.swapped.pop(self.remaining, self.remaining)
+        return index
+
+class FunctionSampler(UniqueSampler):
+    """Draw expressions for distinct functions, each function equally likely.
+
+    The lazy shuffle runs over the functions of the space rather than its
+    expressions, and one of the expressions computing the drawn function is
+    picked at random. Functions already in expression_set are passed over,
+    so a function is never drawn twice and each draw is O(1) amortised.
+    """
+
+    def __init__(self, space, expression_set):
+        self.space = space
+        self.expression_set = expression_set
+        self.keys, self.forms = space.functions(expression_set)
+        self.remaining = len(self.keys)
+        self.swapped = {}
+
+    def available(self):
+        """Number of functions still to be drawn."""
+        return sum(1 for key in self.keys if key not in self.expression_set.keys())
+
+    def draw(self):
+        while True:
+            try:
+                index = self._draw_index()
+            except ExpressionSpaceExhausted:
+                raise ExpressionSpaceExhausted(
+                    f"All {len(self.keys)} functions over {self.space.variables} have already been drawn") from None
+            if self.keys[index] not in self.expression_set.keys():
+                return self.space.unrank(random.choice(self.forms[index]))
+
+def check_capacity(samplers, count):
+    """Fail fast if count expressions for new functions cannot be drawn from the FunctionSamplers.
+
+    When the check passes, draw_new_expression succeeds count times.
+    """
+    available = sum(sampler.available() for sampler in samplers.values())
+    if count > available:
+        raise ExpressionSpaceExhausted(
+            f"Requested {count} unique expressions but only {available} distinct functions exist "
+            f"for {sorted(samplers)} variables")
+
+def draw_new_expression(samplers, existing_expressions):
+    """Draw an expression for a function not yet in existing_expressions and add it there.
+
+    samplers maps a variable count to a FunctionSampler over
+    existing_expressions; the variable count is chosen at random and a
+    count whose functions are used up is dropped. Returns
+    (num_vars, expression) and raises ExpressionSpaceExhausted once every
+    space is exhausted.
+    """
+    while samplers:
+        num_vars = random.choice(list(samplers))
+        try:
+            expression = samplers[num_vars].draw()
+        except ExpressionSpaceExhausted:
+            del samplers[num_vars]
+            continue
+        existing_expressions.add(expression, num_vars)
+        return num_vars, expression
+    raise ExpressionSpaceExhausted("Every function for the available variable counts has already been used")
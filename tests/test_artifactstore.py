@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import artifactstore
+from artifactstore import ArtifactStore
+from rendercache import RenderCache
+
+def put_many(root, count):
+    store = ArtifactStore(root)
+    return {store.put(b'same content' * 100, '.svg', label='diagram', key='k') for _ in range(count)}
+
+def test_files_are_named_by_content(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    path = store.put('<svg/>', '.svg', label='gate')
+    assert path == store.put('<svg/>', '.svg', label='other name')
+    assert os.path.basename(os.path.dirname(path)) + os.path.basename(path)[:-4] == store.entries()[0]['digest']
+    assert store.put('<svg />', '.svg') != path
+    assert [entry['label'] for entry in store.entries()] == ['gate', 'other name', None]
+
+def test_find_and_load_from_a_new_instance(tmp_path):
+    ArtifactStore(str(tmp_path)).put('<svg/>', '.svg', key='text')
+    ArtifactStore(str(tmp_path)).put(b'\x89PNG', '.png', key='bytes')
+    store = ArtifactStore(str(tmp_path))
+    assert store.load('text') == '<svg/>'
+    assert store.load('bytes') == b'\x89PNG'
+    assert store.find('missing') is None and store.load('missing') is None
+
+def test_concurrent_puts_leave_one_file(tmp_path):
+    with ProcessPoolExecutor(4) as pool:
+        paths = set().union(*pool.map(put_many, [str(tmp_path)] * 4, [10] * 4))
+    store = ArtifactStore(str(tmp_path))
+    assert len(paths) == 1
+    assert len(store.entries()) == 1
+    assert store.usage() == len(b'same content' * 100)
+    assert not [name for name in os.listdir(os.path.dirname(paths.pop())) if name.startswith('.tmp-')]
+
+def test_incomplete_manifest_line_is_skipped(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.put('<svg/>', '.svg', key='done')
+    with open(store.manifest_path, 'a', encoding='utf-8') as manifest:
+        manifest.write('{"digest": "ab')
+    assert ArtifactStore(str(tmp_path)).load('done') == '<svg/>'
+    assert len(store.entries()) == 1
+
+def test_gc_removes_least_recently_used(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    paths = [store.put(bytes([i]) * 100, '.png', key=f'k{i}') for i in range(5)]
+    for i, path in enumerate(paths):
+        os.utime(path, (1000 + i, 1000 + i))
+    store.find('k0')  # Using an artifact makes it recent again
+    assert store.gc(max_bytes=250) == 300
+    assert [os.path.exists(path) for path in paths] == [True, False, False, False, True]
+    assert [entry['key'] for entry in store.entries()] == ['k0', 'k4']
+    assert store.find('k1') is None and store.load('k4') == bytes([4]) * 100
+
+def test_gc_clears_stale_temporary_files(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    path = store.put(b'data', '.png')
+    stale = os.path.join(os.path.dirname(path), '.tmp-crashed')
+    open(stale, 'wb').close()
+    os.utime(stale, (time.time() - artifactstore.STALE_AFTER - 1,) * 2)
+    store.gc()
+    assert not os.path.exists(stale) and os.path.exists(path)
+
+def test_repeated_puts_are_recorded_once(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    for _ in range(3):
+        store.put('<svg/>', '.svg', label='gate', key='k')
+        ArtifactStore(str(tmp_path)).put('<svg/>', '.svg', label='gate', key='k')
+    store.put('<svg/>', '.svg', label='gate', key='other')
+    store.put('<svg>new</svg>', '.svg', label='gate', key='k')
+    assert [(entry['key'], entry['size']) for entry in store.entries()] == [('k', 6), ('other', 6), ('k', 14)]
+    assert store.load('k') == '<svg>new</svg>'
+    # Going back to the earlier render is recorded again, as the latest for the key
+    store.put('<svg/>', '.svg', label='gate', key='k')
+    assert len(store.entries()) == 4
+    assert ArtifactStore(str(tmp_path)).load('k') == '<svg/>'
+
+def test_put_restores_a_file_deleted_behind_its_back(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    path = store.put(b'data', '.png', key='k')
+    os.remove(path)
+    assert store.find('k') is None
+    assert store.put(b'data', '.png', key='k') == path
+    assert store.load('k') == b'data'
+
+def hold_lock(root, held, release):
+    with ArtifactStore(root)._lock():
+        held.set()
+        release.wait()
+
+def test_lock_excludes_other_processes_until_released(tmp_path, monkeypatch):
+    store = ArtifactStore(str(tmp_path))
+    with multiprocessing.Manager() as manager:
+        held, release = manager.Event(), manager.Event()
+        holder = multiprocessing.Process(target=hold_lock, args=(str(tmp_path), held, release))
+        holder.start()
+        held.wait()
+        monkeypatch.setattr(artifactstore, 'LOCK_TIMEOUT', 0.1)
+        with pytest.raises(TimeoutError):
+            store.put(b'data', '.png')
+        release.set()
+        holder.join()
+    assert os.path.exists(store.lock_path)
+    store.put(b'data', '.png')
+
+def test_lock_of_a_killed_holder_is_released(tmp_path):
+    with multiprocessing.Manager() as manager:
+        held, release = manager.Event(), manager.Event()
+        holder = multiprocessing.Process(target=hold_lock, args=(str(tmp_path), held, release))
+        holder.start()
+        held.wait()
+        holder.kill()
+        holder.join()
+    ArtifactStore(str(tmp_path)).put(b'data', '.png')
+
+def test_render_cache_reuses_stored_renders(tmp_path):
+    RenderCache(store=ArtifactStore(str(tmp_path))).get_or_render('gate', ('OR',), lambda: '<svg/>')
+    cache = RenderCache(store=ArtifactStore(str(tmp_path)))
+    assert cache.get_or_render('gate', ('OR',), lambda: 1 / 0) == '<svg/>'
+    stats = cache.stats()
+    assert (stats['disk_hits'], stats['misses']) == (1, 0)
+
+def test_reader_follows_a_rewritten_manifest(tmp_path):
+    reader, writer = ArtifactStore(str(tmp_path)), ArtifactStore(str(tmp_path))
+    for i in range(5):
+        writer.put(bytes([i]) * 100, '.png', key=f'k{i}')
+    assert reader.load('k0') == bytes([0]) * 100
+    writer.gc(max_bytes=200)
+    writer.put(b'new' * 100, '.png', key='new')
+    assert reader.load('new') == b'new' * 100
+    assert reader.find('k1') is None
+    assert all('generation' not in entry for entry in writer.entries())
@@ -0,0 +1,88 @@
+import itertools
+
+import pytest
+
+from automaton import SequenceDetector, build_detector, build_multi_detector
+from fsmsim import brute_force_detections, brute_force_outputs, random_stream
+
+def run(detector, stream):
+    """Moore output after every symbol, stepping the flat transition table by hand."""
+    outputs, state = [], 0
+    for symbol in stream:
+        state = detector.transitions[state * len(detector.alphabet) + detector.symbol_index[symbol]]
+        outputs.append(detector.moore_outputs[state])
+    return outputs
+
+@pytest.mark.parametrize('overlapping', [True, False])
+def test_sequence_detector_finds_every_match(overlapping):
+    stream = random_stream(500)
+    for sequence in ('1', '101', '1100', '0000'):
+        detector = SequenceDetector(sequence, overlapping)
+        assert detector.num_states == len(sequence) + 1
+        detections = [i for i, output in enumerate(run(detector, stream)) if output]
+        assert detections == brute_force_detections(stream, sequence, overlapping)
+
+def test_build_detector_reuses_detectors():
+    assert build_detector('101') is build_detector('101')
+    assert build_detector('101') is not build_detector('101', overlapping=False)
+
+def test_trie_has_one_state_per_prefix():
+    detector = build_multi_detector(('101', '100', '11'))
+    # S0, 1, 10, 101, 100, 11
+    assert detector.num_states == 6
+
+@pytest.mark.parametrize('overlapping', [True, False])
+def test_multi_detector_outputs_longest_pattern(overlapping):
+    stream = random_stream(500)
+    for patterns in (('101',), ('101', '0011'), ('1', '01', '001'), ('110', '10')):
+        detector = build_multi_detector(patterns, overlapping)
+        assert run(detector, stream) == brute_force_outputs(stream, patterns, detector.output_codes, overlapping)
+
+def test_multi_detector_output_codes():
+    detector = build_multi_detector(('10', '01'), output_codes=(5, 7))
+    assert run(detector, '1001') == [0, 5, 0, 7]
+
+@pytest.mark.parametrize('patterns, codes', [((), None), (('10', ''), None), (('10',), (0,)), (('12',), None)])
+def test_multi_detector_rejects_bad_input(patterns, codes):
+    with pytest.raises(ValueError):
+        build_multi_detector(patterns, output_codes=codes)
+
+def naive_next_state(sequence, state, symbol, overlapping):
+    """Longest prefix of the sequence that is a suffix of what state has matched plus symbol."""
+    if state == len(sequence) and not overlapping:
+        state = 0
+    seen = sequence[:state] + symbol
+    return next(length for length in range(min(len(seen), len(sequence)), -1, -1)
+                if seen.endswith(sequence[:length]))
+
+@pytest.mark.parametrize('overlapping', [True, False])
+@pytest.mark.parametrize('alphabet', ['01', 'abc'])
+def test_kmp_transitions_match_the_naive_construction(overlapping, alphabet):
+    for length in range(1, 6 if alphabet == '01' else 4):
+        for sequence in map(''.join, itertools.product(alphabet, repeat=length)):
+            detector = SequenceDetector(sequence, overlapping, alphabet)
+            for state in range(detector.num_states):
+                for symbol in alphabet:
+                    assert detector.next_state(state, symbol) == naive_next_state(sequence, state, symbol, overlapping)
+
+def test_non_overlapping_matches_do_not_share_symbols():
+    overlapping, separate = build_detector('1111'), build_detector('1111', overlapping=False)
+    stream = '1' * 12
+    assert [i for i, output in enumerate(run(overlapping, stream)) if output] == list(range(3, 12))
+    assert [i for i, output in enumerate(run(separate, stream)) if output] == [3, 7, 11]
+
+@pytest.mark.parametrize('overlapping', [True, False])
+def test_mealy_outputs_mark_transitions_into_the_final_state(overlapping):
+    detector = build_detector('0110', overlapping)
+    final = detector.state_names[-1]
+    for state, moves in detector.mealy_transitions().items():
+        for symbol, (next_state, output) in moves.items():
+            assert output == ('1' if next_state == final else '0')
+    transitions, outputs = detector.moore_transitions()
+    assert outputs == {name: str(int(name == final)) for name in detector.state_names}
+    assert transitions == {state: {symbol: next_state for symbol, (next_state, _) in moves.items()}
+                           for state, moves in detector.mealy_transitions().items()}
+
+def test_precomputed_transitions_are_kept():
+    detector = build_detector('1011')
+    assert SequenceDetector('1011', transitions=detector.transitions).transitions == detector.transitions
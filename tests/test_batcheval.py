@@ -0,0 +1,32 @@
+import itertools
+
+import numpy as np
+
+from batcheval import (num_words, packed_truth_tables, unpack_truth_tables, truth_table_matrix, popcount,
+                       pairwise_equal, pairwise_hamming, hamming_to)
+
+EXPRESSIONS = ['A and B', 'B and A', 'A or B', 'not (A) or not (B)', 'A']
+
+def brute_force_matrix(exprs, num_vars):
+    rows = list(itertools.product([0, 1], repeat=num_vars))
+    return np.array([[bool(eval(expr, {}, dict(zip('ABCDEF', row)))) for row in rows] for expr in exprs])
+
+def test_matrix_matches_python_for_every_width():
+    for num_vars in (2, 3, 6):
+        exprs = EXPRESSIONS + ['(A and not (B)) or C' if num_vars > 2 else 'A and not (B)']
+        assert truth_table_matrix(exprs, num_vars).tolist() == brute_force_matrix(exprs, num_vars).tolist()
+
+def test_seven_variables_span_two_words():
+    assert num_words(7) == 2
+    packed = packed_truth_tables(['A and B'], 7, 'ABCDEFG')
+    assert packed.shape == (1, 2)
+    assert unpack_truth_tables(packed, 7).sum() == 32
+
+def test_pairwise_comparisons():
+    packed = packed_truth_tables(EXPRESSIONS, 2)
+    matrix = brute_force_matrix(EXPRESSIONS, 2)
+    expected = (matrix[:, None, :] != matrix[None, :, :]).sum(axis=-1)
+    assert pairwise_hamming(packed).tolist() == expected.tolist()
+    assert pairwise_equal(packed).tolist() == (expected == 0).tolist()
+    assert hamming_to(packed, packed[0]).tolist() == expected[0].tolist()
+    assert popcount(packed).tolist() == matrix.sum(axis=1).tolist()
@@ -0,0 +1,42 @@
+import itertools
+import random
+
+import pytest
+
+from bitparallel import variable_masks, truth_table_signature, signature_rows, table_signature, circuit_signature
+from combine import random_circuit
+from evaluator import compile_expression
+
+EXPRESSIONS = ['A', 'not A', '(A) and (not (B))', 'A or B and not C', 'not (A and B or C)',
+               '(A xor B) nand (C nor D)', 'A xnor 1', 'A and 0', '((A) or (B)) and ((C) or (not (D)))']
+
+def brute_force_rows(expr, num_vars):
+    evaluate = compile_expression(expr)
+    return [(values, evaluate(*values)) for values in itertools.product([0, 1], repeat=num_vars)]
+
+def test_variable_masks_follow_product_order():
+    assert variable_masks(3) == (0b11110000, 0b11001100, 0b10101010)
+    for num_vars in range(1, 7):
+        for row, values in enumerate(itertools.product([0, 1], repeat=num_vars)):
+            assert tuple(mask >> row & 1 for mask in variable_masks(num_vars)) == values
+
+def test_signatures_match_row_by_row_evaluation():
+    for expr in EXPRESSIONS:
+        for num_vars in range(4, 7):
+            rows = brute_force_rows(expr, num_vars)
+            signature = truth_table_signature(expr, num_vars)
+            assert signature_rows(signature, num_vars) == rows
+            assert table_signature(rows) == signature
+
+def test_random_circuits_match_row_by_row_evaluation():
+    random.seed(2)
+    for _ in range(200):
+        circuit = random_circuit('abc', random.randint(0, 7))
+        evaluate = compile_expression(circuit, 'abc')
+        expected = table_signature([(values, evaluate(*values)) for values in itertools.product([0, 1], repeat=3)])
+        assert circuit_signature(circuit, 'abc') == expected
+        assert truth_table_signature(str(circuit), 3, 'abc') == expected
+
+def test_unknown_variable_is_rejected():
+    with pytest.raises(ValueError, match="'E'"):
+        truth_table_signature('A and E', 3)
@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import catalogue
+from automaton import SequenceDetector
+from catalogue import SequenceCatalogue, LEVELS, pattern_index, load_catalogue
+
+@pytest.fixture(scope='module')
+def small_catalogue():
+    return SequenceCatalogue.build(max_length=6)
+
+def test_pattern_index_orders_by_length_then_value(small_catalogue):
+    assert pattern_index('000') == 0
+    assert pattern_index('111') == 7
+    assert pattern_index('0000') == 8
+    assert len(small_catalogue) == pattern_index('111111') + 1
+    for index in range(len(small_catalogue)):
+        assert pattern_index(small_catalogue.pattern(index)) == index
+
+@pytest.mark.parametrize('overlapping', [True, False])
+def test_stored_tables_match_built_detectors(small_catalogue, overlapping):
+    for sequence in ('101', '0110', '11111', '010011'):
+        stored = small_catalogue.detector(sequence, overlapping)
+        built = SequenceDetector(sequence, overlapping)
+        assert list(stored.transitions) == list(built.transitions)
+
+def test_patterns_outside_the_catalogue_are_built(small_catalogue):
+    assert '1010101' not in small_catalogue
+    assert list(small_catalogue.detector('1010101').transitions) == list(SequenceDetector('1010101').transitions)
+
+def test_levels_sample_their_lengths(small_catalogue):
+    for level, (low, high) in LEVELS.items():
+        if low > small_catalogue.max_length:
+            with pytest.raises(ValueError):
+                small_catalogue.sample(level)
+            continue
+        for _ in range(50):
+            assert low <= len(small_catalogue.sample(level)) <= high
+
+def test_easy_level_holds_exactly_the_short_patterns(small_catalogue):
+    easy = small_catalogue.sample('easy', 24)
+    assert len(set(easy)) == 24
+    assert {len(sequence) for sequence in easy} == {3, 4}
+    with pytest.raises(ValueError):
+        small_catalogue.sample('easy', 25)
+    with pytest.raises(ValueError):
+        small_catalogue.sample('trivial')
+
+def test_features(small_catalogue):
+    features = small_catalogue.features('1011')
+    assert features['length'] == 4
+    assert features['border'] == 1
+    assert features['difficulty'] == 4 + features['fallback_edges'][0]
+
+def test_load_catalogue_builds_once_and_memory_maps(tmp_path):
+    loaded = load_catalogue(4, str(tmp_path))
+    assert (tmp_path / f"sequences_{catalogue.MIN_LENGTH}_4.npy").exists()
+    assert load_catalogue(4, str(tmp_path)) is loaded
+    assert loaded.pattern(pattern_index('1001')) == '1001'
+
+def build_and_load(directory):
+    return len(load_catalogue(5, directory))
+
+def test_concurrent_first_loads_see_a_complete_file(tmp_path):
+    with ProcessPoolExecutor(4) as pool:
+        sizes = list(pool.map(build_and_load, [str(tmp_path)] * 8))
+    assert sizes == [pattern_index('11111') + 1] * 8
+    assert sorted(os.listdir(tmp_path)) == [f"sequences_{catalogue.MIN_LENGTH}_5.npy"]
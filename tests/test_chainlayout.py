@@ -0,0 +1,50 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from automaton import build_detector, build_multi_detector
+from chainlayout import chain_svg
+from fsmsvg import edge_id, hole_variant
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+
+DETECTORS = [build_detector('1011'), build_detector('0110', overlapping=False),
+             build_detector('abca', alphabet='abc'), build_multi_detector(('101', '0011'))]
+
+def groups(svg, kind):
+    root = ET.fromstring(svg.encode('utf-8'))
+    return {group.get('id'): group for group in root.iter(f'{SVG_NS}g') if group.get('class') == kind}
+
+def label(group):
+    return group.find(f'{SVG_NS}text').text
+
+@pytest.mark.parametrize('detector', DETECTORS)
+@pytest.mark.parametrize('model', ['mealy', 'moore'])
+def test_every_state_and_transition_has_its_id(detector, model):
+    svg = chain_svg(detector, model)
+    edges = groups(svg, 'edge')
+    assert set(edges) == {edge_id(name, symbol) for name in detector.state_names for symbol in detector.alphabet}
+    assert set(groups(svg, 'node')) == {f"node_{name}" for name in detector.state_names}
+
+@pytest.mark.parametrize('detector', DETECTORS)
+def test_labels_follow_the_model(detector):
+    k = len(detector.alphabet)
+    mealy, moore = chain_svg(detector, 'mealy'), chain_svg(detector, 'moore')
+    for state, name in enumerate(detector.state_names):
+        assert label(groups(mealy, 'node')[f"node_{name}"]) == name
+        assert label(groups(moore, 'node')[f"node_{name}"]) == f"{name}/{detector.moore_outputs[state]}"
+        for i, symbol in enumerate(detector.alphabet):
+            target = detector.state_names[detector.transitions[state * k + i]]
+            edge = groups(mealy, 'edge')[edge_id(name, symbol)]
+            assert edge.find(f'{SVG_NS}title').text == f"{name}->{target}"
+            assert label(edge) == f"{symbol}/{detector.mealy_outputs[state * k + i]}"
+            assert label(groups(moore, 'edge')[edge_id(name, symbol)]) == symbol
+
+def test_hole_variant_finds_every_edge():
+    detector = build_detector('1101')
+    svg = chain_svg(detector)
+    for name in detector.state_names:
+        for symbol in detector.alphabet:
+            cut = hole_variant(svg, name, symbol)
+            assert edge_id(name, symbol) not in groups(cut, 'edge')
+            assert len(groups(cut, 'edge')) == len(groups(svg, 'edge')) - 1
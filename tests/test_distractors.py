@@ -0,0 +1,57 @@
+import itertools
+
+import pytest
+
+from bitparallel import truth_table_signature
+from distractors import TruthTableIndex, chain_index, nearby_bit_patterns
+from sampler import ChainSpace
+
+def hamming(expr1, expr2, num_vars):
+    return bin(truth_table_signature(expr1, num_vars) ^ truth_table_signature(expr2, num_vars)).count('1')
+
+def test_index_groups_expressions_by_function():
+    index = chain_index(2)
+    assert len(index) == 14
+    assert sum(len(exprs) for exprs in index.expressions) == ChainSpace('AB').size
+    for exprs in index.expressions:
+        assert len({truth_table_signature(expr, 2) for expr in exprs}) == 1
+
+def test_distances_match_brute_force():
+    index = TruthTableIndex(['A and B', 'A or B', 'not (A)', '(A) and (not (A))'], 2)
+    assert index.distances('A and B').tolist() == [0, 2, 3, 1]
+    for expr in index.neighbours('A', 1):
+        assert hamming(expr, 'A', 2) == 1
+
+def test_distractors_prefer_the_requested_distance():
+    index = chain_index(3)
+    for expr in ('(A) and (B)', '((A) or (not (B))) and (C)'):
+        distractors = index.distractors(expr, 3, distance=1)
+        assert len(distractors) == 3
+        assert len({truth_table_signature(d, 3) for d in distractors}) == 3
+        assert all(hamming(d, expr, 3) == 1 for d in distractors)
+
+@pytest.mark.parametrize('length', range(1, 7))
+def test_nearby_bit_patterns_always_give_three_when_they_exist(length):
+    for values in itertools.product([0, 1], repeat=length):
+        patterns = nearby_bit_patterns(list(values), 3, distance=1)
+        assert len(patterns) == min(3, 2 ** length - 1)
+        assert len({tuple(pattern) for pattern in patterns}) == len(patterns)
+        assert list(values) not in patterns
+        assert all(len(pattern) == length for pattern in patterns)
+
+def test_nearby_bit_patterns_fill_up_from_further_distances():
+    patterns = nearby_bit_patterns([0, 1], 3, distance=1)
+    assert sorted(sum(a != b for a, b in zip(pattern, [0, 1])) for pattern in patterns) == [1, 1, 2]
+
+@pytest.mark.parametrize('num_vars', [3, 5, 6])
+def test_packed_distances_match_brute_force_on_random_functions(num_vars):
+    space = ChainSpace('ABCDEF'[:num_vars])
+    candidates = [space.random() for _ in range(200)]
+    index = TruthTableIndex(candidates, num_vars)
+    for target in candidates[:20]:
+        expected = [hamming(exprs[0], target, num_vars) for exprs in index.expressions]
+        assert index.distances(target).tolist() == expected
+        distractors = index.distractors(target, 3, distance=2)
+        found = sorted(abs(hamming(d, target, num_vars) - 2) for d in distractors)
+        best = sorted(abs(distance - 2) for distance in expected if distance > 0)[:3]
+        assert found == best
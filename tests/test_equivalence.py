@@ -0,0 +1,65 @@
+import itertools
+import random
+
+import pytest
+
+import equivalence
+from equivalence import BDD, check_equivalence, format_input
+from combine import random_circuit
+from evaluator import compile_expression
+from exprparser import parse_expression
+
+VARIABLES = 'abc'
+
+def differs_on(expr1, expr2, assignment):
+    return compile_expression(expr1, VARIABLES)(**assignment) != compile_expression(expr2, VARIABLES)(**assignment)
+
+def truth_table(expr):
+    evaluate = compile_expression(expr, VARIABLES)
+    return [evaluate(*values) for values in itertools.product([0, 1], repeat=len(VARIABLES))]
+
+@pytest.fixture(params=['signature', 'bdd'])
+def method(request, monkeypatch):
+    if request.param == 'bdd':
+        monkeypatch.setattr(equivalence, 'SIGNATURE_MAX_VARS', 0)
+    return request.param
+
+def test_known_identities(method):
+    assert check_equivalence('(a nand b)', '((not a) or (not b))', VARIABLES) == (True, None)
+    assert check_equivalence('(a xor b)', '((a or b) and (not (a and b)))', VARIABLES) == (True, None)
+    assert check_equivalence('(a xnor a)', '(a or (not a))', VARIABLES) == (True, None)
+    equivalent, counterexample = check_equivalence('(a nor b)', '(a xnor b)', VARIABLES)
+    assert not equivalent and differs_on('(a nor b)', '(a xnor b)', counterexample)
+
+def test_random_circuits_agree_with_truth_tables(method):
+    random.seed(4)
+    for _ in range(300):
+        expr1 = random_circuit(VARIABLES, random.randint(0, 5))
+        expr2 = random_circuit(VARIABLES, random.randint(0, 5))
+        equivalent, counterexample = check_equivalence(expr1, expr2, VARIABLES)
+        assert equivalent == (truth_table(expr1) == truth_table(expr2))
+        if equivalent:
+            assert counterexample is None
+        else:
+            assert set(counterexample) == set(VARIABLES)
+            assert differs_on(expr1, expr2, counterexample)
+
+def test_bdd_is_canonical():
+    bdd = BDD(VARIABLES)
+    left = bdd.build(parse_expression('(a and b) or (a and c)'))
+    right = bdd.build(parse_expression('a and (b or c)'))
+    assert left == right
+    assert bdd.build(parse_expression('a and not a')) == 0
+    assert bdd.satisfying_input(0) is None
+    assert compile_expression('a and (b or c)', VARIABLES)(**bdd.satisfying_input(right))
+
+def test_many_variables_use_the_bdd():
+    variables = [f'x{i}' for i in range(20)]
+    chain = ' xor '.join(variables)
+    reordered = ' xor '.join(reversed(variables))
+    assert check_equivalence(chain, reordered, variables) == (True, None)
+    equivalent, counterexample = check_equivalence(chain, f'not ({reordered})', variables)
+    assert not equivalent and len(counterexample) == 20
+
+def test_format_input():
+    assert format_input({'a': 0, 'b': 1}) == 'a=0, b=1'
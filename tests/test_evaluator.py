@@ -0,0 +1,26 @@
+import itertools
+
+from evaluator import VARIABLES, compile_expression, evaluate_expression
+
+EXPRESSIONS = ['A', 'not A', 'A and B', '(A or B) and not (C)', 'not (A and (B or not C))', '(A) or (not (B))']
+
+def test_compiled_expressions_match_python():
+    for expr in EXPRESSIONS:
+        evaluate = compile_expression(expr)
+        for values in itertools.product([0, 1], repeat=3):
+            row = dict(zip('ABC', values))
+            assert evaluate(*values) == bool(eval(expr, {}, row))
+            assert evaluate(**row) == evaluate(*values)
+            assert evaluate_expression(expr, *values) == evaluate(*values)
+
+def test_gates_without_python_operators():
+    for gate, check in (('nand', lambda a, b: not (a and b)), ('nor', lambda a, b: not (a or b)),
+                        ('xor', lambda a, b: a != b), ('xnor', lambda a, b: a == b)):
+        evaluate = compile_expression(f'A {gate} B')
+        for a, b in itertools.product([0, 1], repeat=2):
+            assert evaluate(a, b) == check(a, b)
+
+def test_compiled_once_per_expression():
+    assert compile_expression('A and B') is compile_expression('A and B')
+    assert len(VARIABLES) == 6
+    assert compile_expression('A and F')(1, 0, 0, 0, 0, 1)
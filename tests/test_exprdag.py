@@ -0,0 +1,49 @@
+import gc
+import random
+
+from combine import random_circuit, random_expression
+from exprdag import Node, var, const, gate, format_expression
+from exprparser import parse_expression
+
+def tree_gates(node):
+    """Gates counted as in a tree, so a shared subcircuit counts once per use."""
+    return 0 if node.op in ('var', 'const') else 1 + sum(tree_gates(child) for child in node.args)
+
+def test_nodes_are_hash_consed():
+    a, b = var('a'), var('b')
+    assert var('a') is a and const(1) is const('1')
+    assert gate('and', a, b) is gate('and', var('a'), var('b'))
+    assert gate('and', a, b) is not gate('and', b, a)
+    assert parse_expression('((a and b) xor (not c))').args[0] is gate('and', a, b)
+
+def test_shared_subcircuits_are_visited_once():
+    shared = gate('xor', var('a'), var('b'))
+    root = gate('or', gate('and', shared, var('c')), gate('nand', shared, var('c')))
+    assert root.gate_count() == 4
+    assert tree_gates(root) == 5
+    order = list(root.postorder())
+    assert len(order) == len(set(order)) == 7
+    assert all(order.index(child) < order.index(node) for node in order for child in node.children())
+
+def test_interned_nodes_are_released():
+    before = len(Node._interned)
+    gate('nor', var('unused_p'), var('unused_q'))
+    gc.collect()
+    assert len(Node._interned) == before
+
+def test_random_circuits_keep_to_the_gate_budget():
+    random.seed(5)
+    for num_gates in range(8):
+        for _ in range(50):
+            circuit = random_circuit(['a', 'b', 'c'], num_gates)
+            assert tree_gates(circuit) == num_gates
+            assert circuit.gate_count() <= num_gates
+            assert {node.args[0] for node in circuit.postorder() if node.op == 'var'} <= {'a', 'b', 'c'}
+
+def test_random_expressions_parse_back_to_their_circuit():
+    random.seed(6)
+    for _ in range(100):
+        expression = random_expression(['a', 'b', 'c'], random.randint(0, 7))
+        circuit = parse_expression(expression)
+        assert str(circuit) == expression
+        assert format_expression(circuit) == expression
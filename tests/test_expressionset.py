@@ -0,0 +1,63 @@
+import itertools
+import random
+
+import pytest
+
+from bitparallel import truth_table_signature
+from combine import random_circuit
+from exprdag import format_expression
+from expressionset import MODES, ExpressionSet, canonical_signature, row_maps, transform_signature
+
+def test_duplicates_depend_on_the_mode():
+    pairs = {
+        'function': ('A and B', '(B) and (A)'),
+        'permutation': ('A and not B', 'not A and B'),
+        'npn': ('A and B', 'not A or not B'),
+    }
+    for i, mode in enumerate(MODES):
+        for j, (first, second) in enumerate(pairs.values()):
+            expressions = ExpressionSet(mode)
+            assert expressions.add(first, 2)
+            assert ((second, 2) in expressions) == (j <= i)
+            assert expressions.add(second, 2) == (j > i)
+
+def test_variable_count_is_part_of_the_key():
+    expressions = ExpressionSet()
+    assert expressions.add('A and B', 2)
+    assert expressions.add('A and B', 3)
+    assert len(expressions) == 2 and list(expressions) == ['A and B', 'A and B']
+    assert set(expressions.keys()) == {expressions.key('A and B', 2), expressions.key('A and B', 3)}
+
+@pytest.mark.parametrize('num_vars, classes', [(2, {'function': 16, 'permutation': 12, 'npn': 4}),
+                                               (3, {'function': 256, 'permutation': 80, 'npn': 14})])
+def test_number_of_classes(num_vars, classes):
+    for mode in MODES:
+        canonical = {canonical_signature(signature, num_vars, mode) for signature in range(1 << (1 << num_vars))}
+        assert len(canonical) == classes[mode]
+
+def test_renamed_and_negated_inputs_share_a_class():
+    random.seed(9)
+    for _ in range(200):
+        circuit = random_circuit('ABC', random.randint(0, 6))
+        text = format_expression(circuit, 'plain')
+        signature = truth_table_signature(text, 3)
+        for perm in itertools.permutations('ABC'):
+            renamed = text.translate(str.maketrans('ABC', ''.join(perm)))
+            assert (canonical_signature(truth_table_signature(renamed, 3), 3, 'permutation')
+                    == canonical_signature(signature, 3, 'permutation'))
+            negated = ' '.join(f'(not {token})' if token in 'ABC' else token
+                               for token in renamed.replace('(', '( ').replace(')', ' )').split())
+            assert (canonical_signature(truth_table_signature(f'not ({negated})', 3), 3, 'npn')
+                    == canonical_signature(signature, 3, 'npn'))
+
+def test_canonical_signature_is_fixed_by_every_row_map():
+    for signature in range(0, 256, 7):
+        canonical = canonical_signature(signature, 3, 'npn')
+        for row_map in row_maps(3, True):
+            assert canonical_signature(transform_signature(signature, row_map), 3, 'npn') == canonical
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ExpressionSet('literal')
+    with pytest.raises(ValueError):
+        canonical_signature(1, 2, 'literal')
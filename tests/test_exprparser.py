@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from combine import random_circuit
+from exprdag import DIALECTS, var, gate, format_expression
+from exprparser import tokenize, parse_expression
+from evaluator import compile_expression
+from sampler import ChainSpace, PlainChainSpace
+
+def test_precedence_and_associativity():
+    a, b, c = var('A'), var('B'), var('C')
+    assert parse_expression('A or B and C') is gate('or', a, gate('and', b, c))
+    assert parse_expression('not A and B') is gate('and', gate('not', a), b)
+    assert parse_expression('A xor B or C') is gate('xor', a, gate('or', b, c))
+    assert parse_expression('A nand B nor C') is gate('nor', gate('nand', a, b), c)
+    assert parse_expression('A and B and C') is gate('and', gate('and', a, b), c)
+    assert parse_expression('A and (B and C)') is gate('and', a, gate('and', b, c))
+
+@pytest.mark.parametrize('dialect', DIALECTS)
+def test_every_dialect_round_trips(dialect):
+    random.seed(7)
+    gates = ['and', 'or', 'not'] if dialect == 'python' else None
+    for _ in range(300):
+        circuit = random_circuit(['A', 'B', 'C'], random.randint(0, 7))
+        if gates and any(node.op not in gates + ['var'] for node in circuit.postorder()):
+            with pytest.raises(ValueError):
+                format_expression(circuit, dialect)
+            continue
+        text = format_expression(circuit, dialect)
+        assert parse_expression(text) is circuit
+        assert format_expression(parse_expression(text), dialect) == text
+
+def test_generator_expressions_read_as_python_does():
+    random.seed(8)
+    for space in (ChainSpace('ABC'), PlainChainSpace('ABCD')):
+        for _ in range(200):
+            expr = space.random()
+            evaluate = compile_expression(expr)
+            for row in range(1 << 4):
+                values = dict(zip('ABCD', (row >> 3 & 1, row >> 2 & 1, row >> 1 & 1, row & 1)))
+                assert evaluate(**values) == bool(eval(expr, {}, values))
+
+def test_plain_dialect_uses_minimal_parentheses():
+    assert format_expression(parse_expression('not (A and not B or C)'), 'plain') == 'not (A and not B or C)'
+    assert format_expression(parse_expression('((A) and (B)) or (C)'), 'plain') == 'A and B or C'
+    assert format_expression(parse_expression('(A or B) and C'), 'python') == '((A) or (B)) and (C)'
+
+@pytest.mark.parametrize('expr', ['A and', '(A or B', 'A or B)', 'A & B', 'and A', 'A B', ''])
+def test_malformed_expressions_are_rejected(expr):
+    with pytest.raises(ValueError):
+        parse_expression(expr)
+
+def test_tokenize():
+    assert tokenize('not(A1 xnor 0)') == ['not', '(', 'A1', 'xnor', '0', ')']
@@ -0,0 +1,33 @@
+import pytest
+
+from automaton import build_detector, build_multi_detector
+from fsmconvert import mealy_to_moore, moore_to_mealy, check_conversion, convert, conversion_question
+
+@pytest.mark.parametrize('model', ['mealy', 'moore'])
+def test_convert_keeps_the_output_stream(model):
+    for detector in (build_detector('1101'), build_detector('100', False), build_multi_detector(('101', '0011'))):
+        converted = convert(detector, model)
+        other = 'moore' if model == 'mealy' else 'mealy'
+        assert check_conversion(detector, model, converted, other) == (True, None)
+
+def test_mealy_to_moore_records_origins():
+    moore = mealy_to_moore(build_detector('11'))
+    assert moore.origins[0] == (0, 0)
+    assert len(moore.origins) == moore.num_states
+    for state, (_, output) in enumerate(moore.origins):
+        assert moore.moore_outputs[state] == output
+
+def test_check_conversion_finds_a_counterexample():
+    detector = build_detector('101')
+    wrong = moore_to_mealy(build_detector('100'))
+    same, counterexample = check_conversion(detector, 'mealy', wrong, 'mealy')
+    assert not same
+    assert counterexample == '100'
+
+def test_question_names_every_pattern():
+    text, options, answer = conversion_question(build_multi_detector(('101', '0011')))
+    assert "'101', '0011'" in text
+    assert 'None' not in text
+    assert answer in options and len(set(options)) == 4
+    text, _, _ = conversion_question(build_detector('110', False), 'moore')
+    assert "the sequence '110'" in text
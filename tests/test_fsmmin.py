@@ -0,0 +1,62 @@
+import itertools
+
+import pytest
+
+from automaton import build_detector
+from fsmmin import (TableMachine, from_mealy_dict, from_moore_dict, minimize, is_minimal, canonical_key,
+                    check_machine_equivalence, grade_submissions)
+
+def outputs_on(machine, model, stream):
+    k = len(machine.alphabet)
+    outputs, state = [], 0
+    for symbol in stream:
+        index = state * k + machine.symbol_index[symbol]
+        state = machine.transitions[index]
+        outputs.append(machine.mealy_outputs[index] if model == 'mealy' else machine.moore_outputs[state])
+    return outputs
+
+def all_streams(max_length):
+    for length in range(1, max_length + 1):
+        for symbols in itertools.product('01', repeat=length):
+            yield ''.join(symbols)
+
+def test_minimize_merges_duplicate_states():
+    # S1 and S2 behave alike; S3 is unreachable
+    machine = TableMachine([1, 2, 0, 2, 0, 1, 3, 3], [0, 0, 1, 0, 1, 0, 1, 1], 'mealy')
+    minimal = minimize(machine, 'mealy')
+    assert minimal.num_states == 2
+    assert list(minimal.state_map) == [0, 1, 1, -1]
+    for stream in all_streams(6):
+        assert outputs_on(minimal, 'mealy', stream) == outputs_on(machine, 'mealy', stream)
+
+@pytest.mark.parametrize('model', ['mealy', 'moore'])
+@pytest.mark.parametrize('overlapping', [True, False])
+def test_detectors_keep_their_behaviour(model, overlapping):
+    for sequence in ('1', '11', '101', '1100', '10101'):
+        detector = build_detector(sequence, overlapping)
+        minimal = minimize(detector, model)
+        assert minimal.num_states <= detector.num_states
+        assert is_minimal(minimal, model)
+        for stream in all_streams(8):
+            assert outputs_on(minimal, model, stream) == outputs_on(detector, model, stream)
+
+def test_canonical_key_ignores_state_names():
+    first = from_moore_dict({'S0': {'0': 'S0', '1': 'S1'}, 'S1': {'0': 'S0', '1': 'S1'}}, {'S0': 0, 'S1': 1})
+    second = from_moore_dict({'A': {'0': 'A', '1': 'B'}, 'B': {'0': 'C', '1': 'B'}, 'C': {'0': 'A', '1': 'B'}},
+                             {'A': 0, 'B': 1, 'C': 0}, start='A')
+    assert canonical_key(first, 'moore') == canonical_key(second, 'moore')
+    assert grade_submissions(first, [second, build_detector('11')], 'moore') == [True, False]
+
+def test_equivalence_gives_shortest_counterexample():
+    key = build_detector('101', overlapping=True)
+    assert check_machine_equivalence(key, minimize(key, 'mealy'), 'mealy') == (True, None)
+    other = build_detector('101', overlapping=False)
+    same, counterexample = check_machine_equivalence(key, other, 'mealy')
+    assert not same
+    assert counterexample == '10101'
+
+def test_from_mealy_dict_puts_start_first():
+    machine = from_mealy_dict({'B': {'0': ('A', 0), '1': ('B', 1)}, 'A': {'0': ('A', 0), '1': ('B', 0)}}, start='A')
+    assert machine.state_names == ['A', 'B']
+    assert list(machine.transitions) == [0, 1, 0, 1]
+    assert list(machine.mealy_outputs) == [0, 0, 0, 1]
@@ -0,0 +1,48 @@
+import numpy as np
+
+from automaton import SequenceDetector, build_detector, build_multi_detector
+from fsmsim import (CHUNK_THRESHOLD, simulate, encode_streams, run_states, brute_force_detections, random_stream,
+                    self_check)
+
+def sequential_states(detector, stream):
+    states, state = [], 0
+    for symbol in stream:
+        state = detector.transitions[state * 2 + detector.symbol_index[symbol]]
+        states.append(state)
+    return states
+
+def test_short_stream_matches_sequential_scan():
+    detector = build_detector('1011')
+    stream = random_stream(200)
+    states, _ = simulate(detector, stream)
+    assert states[0].tolist() == sequential_states(detector, stream)
+
+def test_chunked_stream_matches_sequential_scan():
+    for sequence in ('1', '110', '1' * 40 + '0'):
+        for overlapping in (True, False):
+            detector = build_detector(sequence, overlapping)
+            stream = random_stream(3 * CHUNK_THRESHOLD + 7)
+            states = run_states(detector, encode_streams(detector, stream))
+            assert states.shape == (1, len(stream))
+            assert states[0].tolist() == sequential_states(detector, stream)
+
+def test_batch_of_streams():
+    detector = build_detector('010', overlapping=False)
+    streams = [random_stream(64) for _ in range(5)]
+    _, outputs = simulate(detector, streams, 'moore')
+    for stream, row in zip(streams, outputs):
+        assert np.flatnonzero(row).tolist() == brute_force_detections(stream, '010', overlapping=False)
+
+def test_self_check_accepts_every_detector_kind():
+    stream = random_stream(2000)
+    for overlapping in (True, False):
+        assert self_check(build_detector('1101', overlapping), stream)
+        assert self_check(build_multi_detector(('101',), overlapping), stream)
+        assert self_check(build_multi_detector(('101', '0011'), overlapping), stream, 'moore')
+
+def test_self_check_catches_a_wrong_transition():
+    detector = SequenceDetector('1101')
+    broken = SequenceDetector('1101', transitions=[0, 1, 0, 2, 3, 2, 0, 4, 0, 0])
+    stream = '1101' * 50
+    assert self_check(detector, stream)
+    assert not self_check(broken, stream)
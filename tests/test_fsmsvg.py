@@ -0,0 +1,93 @@
+import re
+import shutil
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from automaton import build_detector, build_multi_detector
+from chainlayout import chain_svg
+from fsmsvg import machine_graph, machine_svg, hole_variant, hole_variants, edge_id
+from fsmholes import transition_holes
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+
+def graphviz_style_svg(detector, model):
+    """SVG laid out the way dot writes it: a comment, then a titled <g> per edge with path, arrowhead and label."""
+    parts = ['<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n',
+             '<svg width="300pt" height="100pt" xmlns="http://www.w3.org/2000/svg">\n',
+             '<g id="graph0" class="graph" transform="scale(1 1) rotate(0) translate(4 96)">\n']
+    source = machine_graph(detector, model).source
+    for name in detector.state_names:
+        parts.append(f'<!-- {name} -->\n<g id="node_{name}" class="node">\n<title>{name}</title>\n'
+                     f'<ellipse fill="none" stroke="black" cx="27" cy="-18" rx="27" ry="18"/>\n'
+                     f'<text text-anchor="middle" x="27" y="-14.3" font-family="Times,serif" font-size="14.00">'
+                     f'{name}</text>\n</g>\n')
+    for source_name, target, attrs in re.findall(r'\t(\w+) -> (\w+) \[(.*?)\]', source):
+        group_id = re.search(r'id=(\w+)', attrs).group(1)
+        label = re.search(r'label="?([^" \]]+)', attrs).group(1)
+        parts.append(f'<!-- {source_name}&#45;&gt;{target} -->\n<g id="{group_id}" class="edge">\n'
+                     f'<title>{source_name}&#45;&gt;{target}</title>\n'
+                     f'<path fill="none" stroke="black" d="M54,-18C66,-18 79,-18 91,-18"/>\n'
+                     f'<polygon fill="black" stroke="black" points="90.5,-21.5 100.5,-18 90.5,-14.5 90.5,-21.5"/>\n'
+                     f'<text text-anchor="middle" x="77" y="-21.8" font-family="Times,serif" font-size="14.00">'
+                     f'{label}</text>\n</g>\n')
+    parts.append('</g>\n</svg>\n')
+    return ''.join(parts)
+
+def layouts():
+    yield 'python', lambda detector, model: machine_svg(detector, model, 'python')
+    yield 'graphviz-format', graphviz_style_svg
+    if shutil.which('dot'):
+        yield 'graphviz', lambda detector, model: machine_svg(detector, model, 'graphviz')
+
+DETECTORS = [build_detector('1011'), build_detector('110', overlapping=False), build_multi_detector(('101', '0011'))]
+
+def edge_groups(svg):
+    root = ET.fromstring(svg.encode('utf-8'))
+    groups = {}
+    for group in root.iter(f'{SVG_NS}g'):
+        if group.get('class') == 'edge':
+            group.tail = None  # Whitespace after a group shifts when the next one is cut
+            groups[group.get('id')] = ET.tostring(group)
+    return groups
+
+def all_edges(detector):
+    return [(name, symbol) for name in detector.state_names for symbol in detector.alphabet]
+
+@pytest.mark.parametrize('layout_name, layout', list(layouts()))
+@pytest.mark.parametrize('model', ['mealy', 'moore'])
+def test_drop_removes_only_the_missing_edge(layout_name, layout, model):
+    for detector in DETECTORS:
+        svg = layout(detector, model)
+        groups = edge_groups(svg)
+        assert len(groups) == len(all_edges(detector))
+        for state, symbol in all_edges(detector):
+            cut = edge_groups(hole_variant(svg, state, symbol))
+            removed = edge_id(state, symbol)
+            assert removed not in cut
+            assert cut == {group_id: group for group_id, group in groups.items() if group_id != removed}
+
+@pytest.mark.parametrize('layout_name, layout', list(layouts()))
+def test_grey_changes_only_the_missing_edge(layout_name, layout):
+    for detector in DETECTORS:
+        svg = layout(detector, 'mealy')
+        groups = edge_groups(svg)
+        for state, symbol in all_edges(detector):
+            greyed = edge_groups(hole_variant(svg, state, symbol, 'grey'))
+            target = edge_id(state, symbol)
+            assert set(greyed) == set(groups)
+            assert b'lightgrey' in greyed[target] and b'black' not in greyed[target]
+            assert {i: g for i, g in greyed.items() if i != target} == {i: g for i, g in groups.items() if i != target}
+
+def test_hole_variants_cut_every_question_from_one_layout():
+    detector = build_detector('1101')
+    holes = list(transition_holes(detector, 'moore'))
+    for hole, svg in hole_variants(detector, holes, 'moore', backend='python'):
+        assert edge_id(hole.state, hole.symbol) not in edge_groups(svg)
+
+def test_unknown_edge_or_style_is_rejected():
+    svg = chain_svg(build_detector('10'))
+    with pytest.raises(ValueError):
+        hole_variant(svg, 'S9', '0')
+    with pytest.raises(ValueError):
+        hole_variant(svg, 'S0', '0', 'blur')
@@ -0,0 +1,44 @@
+import os
+from io import BytesIO
+
+from fpdf import FPDF
+
+from artifactstore import ArtifactStore
+from bitparallel import signature_rows
+from imagepipe import truth_table_svg, vector_svg, svg_bytes, add_svg, keep_image
+
+def test_truth_table_svg_draws_each_table_once(tmp_path):
+    rows = signature_rows(0b1000, 2)
+    svg = truth_table_svg(rows, 2)
+    assert b'<svg' in svg[:200]
+    assert truth_table_svg(list(rows), 2) is svg
+    kept = truth_table_svg(rows, 2, str(tmp_path / 'table_1.svg'))
+    assert kept is svg
+    assert ArtifactStore(str(tmp_path)).entries()[0]['label'] == 'table_1'
+
+def test_placeholders_are_drawn():
+    rows = [((0, 0), 0), ((0, 1), '?'), ((1, 0), 1), ((1, 1), '?')]
+    svg = truth_table_svg(rows, 2)
+    assert svg.count(b'>?<') == 2
+
+def test_vector_svg_removes_what_fpdf_cannot_draw():
+    svg = b'  <svg><title>x</title><path style="stroke-dasharray:-;fill:none"/><text font-family="sans">A</text></svg>'
+    cleaned = vector_svg(svg)
+    assert cleaned.startswith(b'<svg')
+    assert b'<title>' not in cleaned and b'dasharray' not in cleaned
+    assert b'font-family="sans-serif"' in cleaned
+    assert svg_bytes('<svg/>') == b'<svg/>'
+
+def test_add_svg_draws_vectors_without_files(tmp_path):
+    pdf = FPDF()
+    pdf.add_page()
+    before = set(os.listdir(tmp_path))
+    add_svg(pdf, truth_table_svg(signature_rows(0b0110, 2), 2), x=10, y=10, w=40)
+    assert set(os.listdir(tmp_path)) == before
+    assert pdf.output()[:4] == b'%PDF'
+
+def test_keep_image_names_files_by_content(tmp_path):
+    first = keep_image(BytesIO(b'png data'), str(tmp_path / 'a.png'))
+    second = keep_image(b'png data', str(tmp_path / 'b.png'))
+    assert first == second and first.endswith('.png')
+    assert [entry['label'] for entry in ArtifactStore(str(tmp_path)).entries()] == ['a', 'b']
@@ -0,0 +1,63 @@
+import itertools
+
+from fpdf import FPDF
+
+from pdftable import ROW_HEIGHT, draw_truth_table, table_cells, truth_table_headers
+
+class RecordingPDF(FPDF):
+    """FPDF that remembers the page and position of every cell drawn."""
+
+    def __init__(self):
+        super().__init__()
+        self.cells = []
+        self.add_page()
+        self.set_font('helvetica', size=11)
+
+    def cell(self, w=None, h=None, text='', *args, **kwargs):
+        self.cells.append((self.page, self.get_y(), text))
+        return super().cell(w, h, text, *args, **kwargs)
+
+def full_table(num_vars):
+    return [(values, sum(values) % 2 == 1) for values in itertools.product([0, 1], repeat=num_vars)]
+
+def rows_by_page(pdf, num_columns):
+    pages = {}
+    for start in range(0, len(pdf.cells), num_columns):
+        page, y, _ = pdf.cells[start]
+        pages.setdefault(page, []).append((y, [text for _, _, text in pdf.cells[start:start + num_columns]]))
+    return pages
+
+def test_cells_and_headers():
+    assert truth_table_headers(3) == ['A', 'B', 'C', 'Q']
+    assert table_cells([((0, 1), True), ((1, 0), '?')]) == [['0', '1', '1'], ['1', '0', '?']]
+
+def test_large_table_is_split_with_the_header_repeated():
+    pdf = RecordingPDF()
+    headers, rows = truth_table_headers(6), table_cells(full_table(6))
+    y = draw_truth_table(pdf, headers, rows)
+    pages = rows_by_page(pdf, len(headers))
+    assert len(pages) > 1 and pdf.page == max(pages)
+    drawn = []
+    for page, page_rows in sorted(pages.items()):
+        assert page_rows[0][1] == headers
+        assert all(top + ROW_HEIGHT <= pdf.page_break_trigger for top, _ in page_rows)
+        drawn.extend(texts for _, texts in page_rows[1:])
+    assert drawn == rows
+    assert y == pages[pdf.page][-1][0] + ROW_HEIGHT
+
+def test_small_table_stays_on_one_page():
+    pdf = RecordingPDF()
+    rows = table_cells(full_table(3))
+    draw_truth_table(pdf, truth_table_headers(3), rows)
+    assert pdf.page == 1 and len(rows_by_page(pdf, 4)[1]) == len(rows) + 1
+
+def test_header_is_not_left_alone_at_the_bottom():
+    pdf = RecordingPDF()
+    draw_truth_table(pdf, truth_table_headers(2), table_cells(full_table(2)), y=pdf.page_break_trigger - ROW_HEIGHT)
+    assert {page for page, _, _ in pdf.cells} == {2}
+
+def test_placeholders_are_drawn_as_given():
+    pdf = RecordingPDF()
+    truth_table = [(values, '?' if i == 2 else Q) for i, (values, Q) in enumerate(full_table(2))]
+    draw_truth_table(pdf, truth_table_headers(2), table_cells(truth_table))
+    assert [text for _, _, text in pdf.cells[5::3]] == ['0', '1', '?', '0']
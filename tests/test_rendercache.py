@@ -0,0 +1,48 @@
+import threading
+
+from rendercache import RenderCache, content_key
+
+def test_content_key_separates_types_and_splits():
+    assert content_key('gate', ('AND',)) == content_key('gate', ('AND',))
+    assert content_key('gate', (1,)) != content_key('gate', ('1',))
+    assert content_key('gate', ('ab', 'c')) != content_key('gate', ('a', 'bc'))
+    assert content_key('gate', (b'x',)) != content_key('gate', ('x',))
+    assert content_key('gate', ('x',)) != content_key('circuit', ('x',))
+
+def test_renders_once_per_content():
+    cache = RenderCache()
+    calls = []
+    render = lambda: calls.append(1) or '<svg/>'
+    for _ in range(3):
+        assert cache.get_or_render('gate', ('AND',), render) == '<svg/>'
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 1)
+
+def test_evicts_least_recently_used_by_size():
+    cache = RenderCache(max_bytes=10)
+    cache.put('a', b'1234')
+    cache.put('b', b'1234')
+    cache.get('a')
+    cache.put('c', b'1234')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1234' and cache.get('c') == b'1234'
+    assert cache.stats()['bytes'] == 8
+    # Larger than the whole cache: returned but not kept
+    assert cache.put('d', b'x' * 11) == b'x' * 11
+    assert len(cache) == 2
+
+def test_size_bound_holds_across_threads():
+    cache = RenderCache(max_bytes=1000)
+
+    def work(thread):
+        for i in range(200):
+            cache.get_or_render('t', (thread, i % 50), lambda: b'x' * 30)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()['bytes'] <= 1000
+    assert cache.stats()['bytes'] == sum(len(data) for data in cache.entries.values())
@@ -0,0 +1,74 @@
+from collections import Counter
+
+import pytest
+
+from expressionset import ExpressionSet
+from sampler import (ChainSpace, PlainChainSpace, ExpressionSpaceExhausted, FunctionSampler, check_capacity,
+                     draw_new_expression)
+
+def function_samplers(existing, space_class=ChainSpace, var_counts=(2, 3)):
+    return {num_vars: space_class('ABCDEF'[:num_vars]).function_sampler(existing) for num_vars in var_counts}
+
+def test_unique_sampler_draws_every_expression_once():
+    space = ChainSpace('AB', max_ops=1)
+    sampler = space.sampler()
+    drawn = [sampler.draw() for _ in range(space.size)]
+    assert sorted(drawn) == sorted(space.unrank(i) for i in range(space.size))
+    with pytest.raises(ExpressionSpaceExhausted):
+        sampler.draw()
+
+def test_functions_group_every_expression():
+    space = ChainSpace('AB')
+    existing = ExpressionSet()
+    keys, forms = space.functions(existing)
+    assert len(keys) == 14
+    assert sorted(index for indices in forms for index in indices) == list(range(space.size))
+    for key, indices in zip(keys, forms):
+        assert {existing.key(space.unrank(index), 2) for index in indices} == {key}
+    # Enumerated once per deduplication mode
+    assert space.functions(ExpressionSet()) is space.functions(existing)
+    assert len(space.functions(ExpressionSet('npn'))[0]) < len(keys)
+
+def test_capacity_counts_distinct_functions():
+    existing = ExpressionSet()
+    samplers = function_samplers(existing)
+    assert sum(sampler.space.size for sampler in samplers.values()) == 6820
+    check_capacity(samplers, 110)
+    with pytest.raises(ExpressionSpaceExhausted):
+        check_capacity(samplers, 111)
+
+@pytest.mark.parametrize('space_class', [ChainSpace, PlainChainSpace])
+def test_every_draw_succeeds_up_to_capacity(space_class):
+    existing = ExpressionSet()
+    samplers = function_samplers(existing, space_class)
+    capacity = sum(sampler.available() for sampler in samplers.values())
+    check_capacity(samplers, capacity)
+    for _ in range(capacity):
+        draw_new_expression(samplers, existing)
+    assert len(existing) == capacity
+    with pytest.raises(ExpressionSpaceExhausted):
+        draw_new_expression(samplers, existing)
+
+def test_capacity_excludes_functions_already_used():
+    existing = ExpressionSet()
+    existing.add('A and B', 2)
+    samplers = function_samplers(existing)
+    for _ in range(99):
+        draw_new_expression(samplers, existing)
+    check_capacity(samplers, 10)
+    with pytest.raises(ExpressionSpaceExhausted):
+        check_capacity(samplers, 11)
+    assert len(existing) == 100
+
+def test_functions_are_drawn_uniformly():
+    # In the 2 variable space some functions have over five times as many forms as others
+    space = ChainSpace('AB')
+    forms = space.functions(ExpressionSet())[1]
+    assert max(map(len, forms)) > 5 * min(map(len, forms))
+    first_draws = Counter()
+    for _ in range(2800):
+        existing = ExpressionSet()
+        expression = FunctionSampler(space, existing).draw()
+        first_draws[existing.key(expression, 2)] += 1
+    assert len(first_draws) == 14
+    assert max(first_draws.values()) < 2 * min(first_draws.values())